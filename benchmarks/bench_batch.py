@@ -0,0 +1,53 @@
+"""
+Random self-play throughput of BoardBatch against one Board per game.
+
+Run with ::
+
+  python benchmarks/bench_batch.py --size 4 --n 10000
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+import nimm
+
+
+def bench_batch(size: int, n: int, steps: int, rng: np.random.Generator) -> float:
+    """ finished games per second when stepping <n> boards together """
+    batch = nimm.board.BoardBatch(n, size=size)
+    games, masks = 0, batch.get_legal_masks()
+    start = timeit.default_timer()
+    for _ in range(steps):
+        masks, done, _ = batch.step(batch.random_actions(rng, masks))
+        games += done.sum()
+    return games / (timeit.default_timer() - start)
+
+
+def bench_single(size: int, games: int, rng: np.random.Generator) -> float:
+    """ finished games per second when playing one Board at a time """
+    start = timeit.default_timer()
+    for _ in range(games):
+        board = nimm.board.Board(size=size)
+        while not board.is_gameover():
+            mvs = board.get_legal_moves()
+            board.push_mv(mvs[rng.integers(len(mvs))])
+    return games / (timeit.default_timer() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', type=int, default=4)
+    parser.add_argument('--n', type=int, default=10000)
+    parser.add_argument('--steps', type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    single = bench_single(args.size, 200, rng)
+    batch = bench_batch(args.size, args.n, args.steps, rng)
+    print(f'size {args.size}: Board {single:>10.0f} games/s  '
+          f'BoardBatch({args.n}) {batch:>10.0f} games/s  speedup {batch / single:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare the dense NumPy Board against the integer bitmask BitBoard.
+
+Run with ::
+
+  python benchmarks/bench_board.py --sizes 4 8 16 32
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+import nimm
+
+
+def _first_move(board) -> list:
+    """ legal move clearing the full bottom row """
+    return [board.size - 1, 0, 2 * board.size - 2]
+
+
+def _time_push(cls, size: int, mv: list, number: int) -> float:
+    """ best time over three rounds for pushing one move on fresh boards """
+    best = np.inf
+    for _ in range(3):
+        boards = [cls(size=size) for _ in range(number)]
+        start = timeit.default_timer()
+        for board in boards:
+            board.push_mv(mv)
+        best = min(best, timeit.default_timer() - start)
+    return best
+
+
+def bench(cls, size: int, number: int) -> dict:
+    """ time the hot board operations for one backend and size, in microseconds """
+    board = cls(size=size)
+    mv = _first_move(board)
+    timings = {
+        'init': lambda: cls(size=size),
+        'legal_moves': board.get_legal_moves,
+        'gameover': board.is_gameover,
+        'repr': lambda: repr(board),
+    }
+    times = {name: min(timeit.repeat(fcn, number=number, repeat=3))
+             for name, fcn in timings.items()}
+    times['push'] = _time_push(cls, size, mv, number)
+    return {name: time / number * 1e6 for name, time in times.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 8, 16, 32])
+    parser.add_argument('--number', type=int, default=5)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        dense = bench(nimm.board.Board, size, args.number)
+        bits = bench(nimm.board.BitBoard, size, args.number)
+        assert np.array_equal(nimm.board.Board(size=size).get_legal_moves(),
+                              nimm.board.BitBoard(size=size).get_legal_moves())
+        print(f'size {size}')
+        for name in dense:
+            print(f'  {name:<12} Board {dense[name]:>12.1f} us  '
+                  f'BitBoard {bits[name]:>12.1f} us  '
+                  f'speedup {dense[name] / bits[name]:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
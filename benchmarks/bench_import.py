@@ -0,0 +1,66 @@
+"""
+Import time of nimm, measured with python -X importtime.
+
+Fails if a headless import pulls in the GUI (tkinter, PIL), any other
+third party package than numpy, or takes longer than the budget ::
+
+  python benchmarks/bench_import.py --budget-ms 50
+"""
+import argparse
+import importlib.util
+import subprocess
+import sys
+
+FORBIDDEN = ('tkinter', '_tkinter', 'PIL')
+ALLOWED = ('numpy', 'nimm')
+
+
+def import_times(code: str) -> dict:
+    """ (self, cumulative) import time in microseconds of every module imported by <code> """
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def check(module: str, budget_ms: float) -> list:
+    """ list of problems found importing <module> """
+    startup = import_times('pass')
+    import_times(f'import {module}')  # warm up, byte-compiling is not import time
+    times = {name: t for name, t in import_times(f'import {module}').items()
+             if name not in startup}
+    tops = {name.split('.')[0] for name in times}
+    problems = [f'{module} imports {top}' for top in sorted(tops) if top in FORBIDDEN]
+    stdlib = getattr(sys, 'stdlib_module_names', None)
+    if stdlib is not None:
+        problems += [f'{module} imports third party package {top}' for top in sorted(tops)
+                     if top not in stdlib and top not in ALLOWED and top not in FORBIDDEN
+                     and importlib.util.find_spec(top) is not None]
+    total = times[module][1] / 1e3
+    own = sum(t[0] for name, t in times.items() if name.split('.')[0] == 'nimm') / 1e3
+    print(f'{module:<14} {total:>8.1f} ms total  {own:>8.1f} ms in nimm itself')
+    if own > budget_ms:
+        problems.append(f'{module} spent {own:.1f} ms in nimm, budget is {budget_ms:.1f} ms')
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--budget-ms', type=float, default=50.,
+                        help='budget for the time spent in nimm modules themselves')
+    parser.add_argument('--modules', nargs='+', default=['nimm', 'nimm.board'])
+    args = parser.parse_args()
+
+    problems = [p for module in args.modules for p in check(module, args.budget_ms)]
+    for problem in problems:
+        print(f'FAIL: {problem}')
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""
+Playouts per second of PlayerMCTS by board size, to size search budgets.
+
+Run with ::
+
+  python benchmarks/bench_mcts.py --sizes 4 8 16 24 --budget 1
+"""
+import argparse
+
+import numpy as np
+
+import nimm
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 8, 16, 24])
+    parser.add_argument('--budget', type=float, default=1.)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        board = nimm.board.Board(size=size)
+        player = nimm.player.PlayerMCTS(board, rng=np.random.default_rng(0), budget=args.budget)
+        player.choose_move()
+        print(f'size {size:>3}  {player.stats["playouts_per_sec"]:>10.0f} playouts/s  '
+              f'{player.stats["playouts"]:>8} playouts in {player.stats["elapsed"]:.2f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+Per-decision latency of PlayerComputer.choose_move by board size.
+
+Run with ::
+
+  python benchmarks/bench_player.py --sizes 4 8 16 24
+"""
+import argparse
+import timeit
+
+import nimm
+
+
+def bench(size: int, difficulty: int, number: int) -> float:
+    """ best time of one decision on the starting position, in microseconds """
+    board = nimm.board.Board(size=size)
+    player = nimm.player.PlayerComputer(board, difficulty=difficulty)
+    return min(timeit.repeat(player.choose_move, number=number, repeat=3)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 8, 16, 24])
+    parser.add_argument('--difficulties', type=int, nargs='+', default=[0, 3])
+    parser.add_argument('--number', type=int, default=10)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        times = '  '.join(f'difficulty {dfc}: {bench(size, dfc, args.number):>10.1f} us'
+                          for dfc in args.difficulties)
+        print(f'size {size:>3}  {times}')
+
+
+if __name__ == '__main__':
+    main()
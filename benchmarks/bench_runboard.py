@@ -0,0 +1,73 @@
+"""
+Memory and move timings of the run-length RunBoard on very large boards.
+
+The dense Board is only timed up to --dense-max, its action table
+grows with the cube of the size. Run with ::
+
+  python benchmarks/bench_runboard.py --sizes 16 64 256 1024 4096
+"""
+import argparse
+import timeit
+import tracemalloc
+from itertools import islice
+
+import numpy as np
+
+import nimm
+
+
+def _random_moves(size: int, n: int, rng: np.random.Generator) -> list:
+    """ <n> short ranges on random rows of a board of size <size>, not all of them legal """
+    rows = rng.integers(size, size=n)
+    lo = (rng.random(n) * (2 * rows + 1)).astype(int)
+    hi = np.minimum(lo + rng.integers(3, size=n), 2 * rows)
+    return list(zip(rows.tolist(), lo.tolist(), hi.tolist()))
+
+
+def bench(cls, size: int, moves: list) -> dict:
+    """ peak memory of a fresh board in KiB, push and first-moves timings in microseconds """
+    tracemalloc.start()
+    board = cls(size=size)
+    peak = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+
+    start = timeit.default_timer()
+    pushed = 0
+    for row, lo, hi in moves:
+        try:
+            board.push(row, (lo, hi))
+            pushed += 1
+        except ValueError:
+            pass
+    push = (timeit.default_timer() - start) / max(pushed, 1) * 1e6
+
+    if isinstance(board, nimm.board.RunBoard):
+        def first() -> list:
+            return list(islice(board.iter_moves(distinct=True), 100))
+    else:
+        def first() -> np.ndarray:
+            return board.get_legal_moves()[:100]
+    moves = min(timeit.repeat(first, number=1, repeat=3)) * 1e6
+    return {'memory KiB': peak, 'push us': push, 'first 100 moves us': moves}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[16, 64, 256, 1024, 4096])
+    parser.add_argument('--moves', type=int, default=2000)
+    parser.add_argument('--dense-max', type=int, default=128)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        moves = _random_moves(size, args.moves, np.random.default_rng(size))
+        classes = [nimm.board.RunBoard]
+        if size <= args.dense_max:
+            classes.insert(0, nimm.board.Board)
+        for cls in classes:
+            result = ''.join(f'  {name} {value:>10.1f}'
+                             for name, value in bench(cls, size, moves).items())
+            print(f'size {size:>5}  {cls.__name__:<9}{result}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,30 @@
+"""
+Nodes per second, depth reached and transposition table hit rate of
+PlayerSearch by board size.
+
+Run with ::
+
+  python benchmarks/bench_search.py --sizes 3 4 6 8 --budget 1
+"""
+import argparse
+
+import nimm
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[3, 4, 6, 8])
+    parser.add_argument('--budget', type=float, default=1.)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        board = nimm.board.Board(size=size)
+        player = nimm.player.PlayerSearch(board, budget=args.budget)
+        player.choose_move()
+        stats = player.stats
+        print(f'size {size:>3}  depth {stats["depth"]:>2}  {stats["nodes"]:>8} nodes  '
+              f'{stats["nodes_per_sec"]:>8.0f} nodes/s  tt hit rate {stats["tt_hit_rate"]:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+"""
+Benchmark suite of the board, move generation and computer players.
+
+Every case is timed on a range of board sizes. The results can be
+saved as a baseline and later runs compared against it, so that
+regressions show up between commits ::
+
+  python benchmarks/suite.py --save baseline.json
+  git checkout my-branch
+  python benchmarks/suite.py --compare baseline.json
+
+Besides the time per call at every size, the growth exponent k of a
+power law fit t ~ size**k is reported for every case.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import timeit
+
+import numpy as np
+
+import nimm
+from nimm.board.Board import _make_board
+
+
+def _computer_game(size: int, seed: int) -> None:
+    """ one headless game between two computer players """
+    rng = np.random.default_rng(seed)
+    board = nimm.board.Board(size=size)
+    p1 = nimm.player.PlayerComputer(board, rng=rng)
+    p2 = nimm.player.PlayerComputer(board, start=False, rng=rng)
+    nimm.game.Game(p1, p2, board, headless=True).play()
+
+
+def _push_setup(size: int):
+    """ pushing clears a row for good, so every call gets its own fresh board """
+    boards = []
+
+    def _push() -> None:
+        if not boards:
+            boards.extend(nimm.board.Board(size=size) for _ in range(64))
+        boards.pop().push(size - 1, (0, 2 * size - 2))
+    return _push
+
+
+def _cases(size: int) -> dict:
+    """ callables to time on a board of size <size>, by case name """
+    board = nimm.board.Board(size=size)
+    player = nimm.player.PlayerComputer(board, rng=np.random.default_rng(0))
+    return {
+        'make_board': lambda: _make_board(size),
+        'init': lambda: nimm.board.Board(size=size),
+        'legal_moves': board.get_legal_moves,
+        'push': _push_setup(size),
+        'repr': lambda: repr(board),
+        'choose_move': player.choose_move,
+        'game': lambda: _computer_game(size, 0),
+    }
+
+
+def _time(fcn, min_time: float) -> float:
+    """ best time of one call over three rounds of at least <min_time> seconds, in seconds """
+    number, elapsed = 1, 0.
+    while True:
+        elapsed = timeit.timeit(fcn, number=number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+    best = min([elapsed] + timeit.repeat(fcn, number=number, repeat=2))
+    return best / number
+
+
+def _exponent(sizes: list, times: list) -> float:
+    """ k of the least squares fit of log(t) = k log(size) + c """
+    return float(np.polyfit(np.log(sizes), np.log(times), 1)[0])
+
+
+def _revision() -> str:
+    """ git revision of the working tree, empty if unknown """
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                             cwd=os.path.dirname(os.path.abspath(__file__)),
+                             capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+    return out.stdout.strip()
+
+
+def run(sizes: list, cases: list = None, min_time: float = 0.05) -> dict:
+    """ time all <cases> (all if None) on all <sizes>, times in seconds per call """
+    results = {}
+    for size in sizes:
+        for name, fcn in _cases(size).items():
+            if cases is None or name in cases:
+                results.setdefault(name, {})[str(size)] = _time(fcn, min_time)
+    return {'revision': _revision(), 'python': platform.python_version(),
+            'numpy': np.__version__, 'sizes': list(sizes), 'results': results}
+
+
+def report(result: dict, baseline: dict = None, threshold: float = 1.1) -> int:
+    """
+    print the times and scaling exponents, relative to <baseline> if given.
+    Returns the number of timings slower than <threshold> times the baseline.
+    """
+    sizes = [str(size) for size in result['sizes']]
+    against = f' against {baseline["revision"] or "baseline"}' if baseline else ''
+    print(f'revision {result["revision"] or "unknown"}{against}, times in us per call')
+    width = 12 if baseline is None else 20
+    print(f'{"case":<12}' + ''.join(f'{size:>{width}}' for size in sizes) + f'{"exponent":>10}')
+    regressions = 0
+    for name, times in result['results'].items():
+        base = {} if baseline is None else baseline['results'].get(name, {})
+        cells = []
+        for size in sizes:
+            cell = f'{times[size] * 1e6:.1f}'
+            if size in base:
+                ratio = times[size] / base[size]
+                regressions += ratio > threshold
+                cell += f' {ratio:.2f}x' + ('!' if ratio > threshold else '')
+            cells.append(f'{cell:>{width}}')
+        fit = _exponent([int(size) for size in sizes], [times[size] for size in sizes]) \
+            if len(sizes) > 1 else float('nan')
+        print(f'{name:<12}' + ''.join(cells) + f'{fit:>10.2f}')
+    if baseline is not None:
+        print(f'{regressions} timings slower than {threshold:.2f}x the baseline')
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 8, 12, 16, 20, 24])
+    parser.add_argument('--cases', nargs='+', default=None,
+                        help='cases to run, all by default')
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help='seconds per timing round')
+    parser.add_argument('--save', help='write the results to this json file')
+    parser.add_argument('--compare', help='json file of a previous run to compare against')
+    parser.add_argument('--threshold', type=float, default=1.1,
+                        help='slowdown ratio counted as regression')
+    args = parser.parse_args()
+
+    result = run(args.sizes, args.cases, args.min_time)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+    regressions = report(result, baseline, args.threshold)
+    if args.save:
+        with open(args.save, 'w') as fh:
+            json.dump(result, fh, indent=2)
+    raise SystemExit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,15 @@
 __all__ = [
     'player',
     'board',
-    'game'
+    'game',
+    'solver',
+    'stats',
+    'train'
 ]
 
 from . import player
 from . import board
 from . import game
+from . import solver
+from . import stats
+from . import train
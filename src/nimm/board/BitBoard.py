@@ -0,0 +1,250 @@
+from functools import lru_cache
+from time import perf_counter
+import numpy as np
+from .Board import _render, _action_table, _legal_mask, encode_move, decode_move
+
+
+def _start_masks(size: int) -> list:
+    """ row bitmasks of a new board of size <size>, row i holds the straws 0 to 2i """
+    return [(1 << (2 * row + 1)) - 1 for row in range(size)]
+
+
+def _to_masks(board: np.ndarray) -> list:
+    """ convert the rows of a dense board into integer bitmasks (bit j <-> column j) """
+    nbytes = (board.shape[1] + 7) // 8
+    packed = np.packbits(board != 0, axis=1, bitorder='little')
+    return [int.from_bytes(row.tobytes(), 'little') for row in packed[:, :nbytes]]
+
+
+def _to_bits(masks: list, shape: tuple) -> np.ndarray:
+    """
+    convert integer row bitmasks into a dense boolean board. Rows of up
+    to 64 columns are shifted out of one uint64 per row, wider ones are
+    unpacked from their bytes.
+    """
+    if shape[1] <= 64:
+        words = np.array(masks, dtype=np.uint64).reshape(-1, 1)
+        return (words >> np.arange(shape[1], dtype=np.uint64)) & np.uint64(1) != 0
+    nbytes = (shape[1] + 7) // 8
+    packed = np.frombuffer(b''.join(mask.to_bytes(nbytes, 'little') for mask in masks),
+                           dtype=np.uint8).reshape(len(masks), nbytes)
+    return np.unpackbits(packed, axis=1, count=shape[1], bitorder='little') != 0
+
+
+def _to_dense(masks: list, shape: tuple) -> np.ndarray:
+    """ convert integer row bitmasks back into a dense float board """
+    return _to_bits(masks, shape).astype(float)
+
+
+@lru_cache(maxsize=None)
+def _span_masks(cols: int) -> np.ndarray:
+    """
+    uint64 bitmask of the range (lower, upper) of every move within a row
+    of <cols> columns, in the order of the action space, see _action_table
+    """
+    lwr, upr = np.triu_indices(cols)
+    full = np.uint64(2) ** upr.astype(np.uint64) * np.uint64(2) - np.uint64(1)
+    masks = full ^ (np.uint64(2) ** lwr.astype(np.uint64) - np.uint64(1))
+    masks.setflags(write=False)
+    return masks
+
+
+@lru_cache(maxsize=1 << 14)
+def _row_text(mask: int, cols: int) -> str:
+    """ text of one row bitmask as rendered by Board.__repr__, cached per mask """
+    return _render(_to_bits([mask], (1, cols)))
+
+
+def _range_mask(lo: int, hi: int) -> int:
+    """ bitmask with the bits lo to hi (inclusive) set """
+    return ((1 << (hi + 1)) - 1) ^ ((1 << lo) - 1)
+
+
+class BitBoard:
+    """
+    Playing Board for the nimm game storing every row as an integer bitmask.
+    Drop-in replacement for Board: pushing a move, clearing a range and
+    checking for an empty board are a handful of bit operations instead
+    of NumPy calls on tiny arrays. Legal moves and the text of the board
+    are built from the row bitmasks, only _board makes a dense copy.
+    """
+    def __init__(self, pos: np.ndarray = None, size: int = 4) -> None:
+        self.size = size
+        self._prev = []
+        if pos is None:
+            self._shape = (size, 2 * size - 1)
+            self._rows = _start_masks(size)
+            straws = size ** 2
+        else:
+            self._shape = pos.shape
+            self._rows = _to_masks(pos)
+            straws = np.count_nonzero(pos)
+        self._history = np.empty(straws, dtype=np.int32)
+        self._nmoves = 0
+        self._turn = True
+        self._key = None
+        self._stats = None
+        return None
+
+    @property
+    def _board(self) -> np.ndarray:
+        """ dense copy of the position, compatible with Board._board """
+        return _to_dense(self._rows, self._shape)
+
+    def reset(self) -> None:
+        """ quick reset board to start """
+        self._prev = []
+        self._shape = (self.size, self.size * 2 - 1)
+        self._rows = _start_masks(self.size)
+        if len(self._history) < self.size ** 2:
+            self._history = np.empty(self.size ** 2, dtype=np.int32)
+        self._nmoves = 0
+        self._turn = True
+        self._key = None
+
+    @property
+    def _moves(self) -> list:
+        """ history as a list of [row, (lower, upper)], for compatibility """
+        return [[row, (lo, hi)] for row, lo, hi in self.decode(self.history()).tolist()]
+
+    def history(self) -> np.ndarray:
+        """ packed indices of all moves played so far, read-only view """
+        history = self._history[:self._nmoves]
+        history.setflags(write=False)
+        return history
+
+    def last_move(self) -> list:
+        """ last move played as [row, lower, upper] """
+        if self._nmoves == 0:
+            raise IndexError('no move to take back')
+        return self.decode(self._history[self._nmoves - 1]).tolist()
+
+    def encode(self, row, lo, hi):
+        """ packed index of a move on this board, see Board.encode_move """
+        return encode_move(self._shape, row, lo, hi)
+
+    def decode(self, index) -> np.ndarray:
+        """ move (row, lower, upper) of a packed index on this board """
+        return decode_move(self._shape, index)
+
+    def instrument(self, stats=None) -> None:
+        """ count pushes and pops and time legal move generation in <stats>, None stops """
+        self._stats = stats
+
+    def push_mv(self, mv) -> bool:
+        """ quick push fcn compatible with legal moves, or a packed index """
+        if isinstance(mv, (int, np.integer)):
+            mv = self.decode(mv)
+        return self.push(mv[0], (mv[1], mv[2]))
+
+    def push(self, row: int, col: tuple) -> bool:
+        """
+        push a move given by the row index and the
+        column specified by a tuple from start to end,
+        see Board.push for an example.
+
+        Returns: True if move was processed.
+        """
+        assert len(col) == 2, 'column argument needs to be tuple with ' + \
+            f'length 2, but is: {col}'
+        lo, hi = int(col[0]), int(col[1])
+        if not (0 <= row < self._shape[0] and 0 <= lo <= hi < self._shape[1]):
+            raise ValueError(f'Move: {row=} {col=} is not on the board')
+        if not self._rows[row] & _range_mask(lo, hi):
+            raise ValueError(f'Move: {row=} {col=} does not remove any straw')
+        self._prev.append(self._rows[row])
+        self._rows[row] &= ~_range_mask(lo, hi)
+        self._history[self._nmoves] = self.encode(row, lo, hi)
+        self._nmoves += 1
+        self._turn = not self._turn
+        self._key = None
+        if self._stats is not None:
+            self._stats.count('push')
+        return True
+
+    def pop(self) -> list:
+        """
+        take back the last move pushed on the board and
+        restore the row it was played in.
+
+        Returns: the move as [row, col].
+        """
+        row, lo, hi = self.last_move()
+        self._rows[row] = self._prev.pop()
+        self._nmoves -= 1
+        self._turn = not self._turn
+        self._key = None
+        if self._stats is not None:
+            self._stats.count('pop')
+        return [row, (lo, hi)]
+
+    def get_legal_moves(self) -> np.ndarray:
+        """
+        get all legal moves in the current position as an array
+        of (row, lower, upper), in the same order as Board.get_legal_moves.
+        """
+        return self.action_space()[self.get_legal_mask()]
+
+    def get_legal_indices(self) -> np.ndarray:
+        """ packed indices of all legal moves, in the order of get_legal_moves """
+        return np.flatnonzero(self.get_legal_mask())
+
+    def get_legal_mask(self) -> np.ndarray:
+        """
+        boolean mask over the fixed action space of the board,
+        True for every move that removes at least one straw.
+        Rows of up to 64 columns test the range mask of every move
+        against the row bitmask, wider rows fall back to Board's prefix sums.
+        Every legal move query goes through here, so it is timed if instrumented.
+        """
+        if self._stats is None:
+            return self._legal_mask()
+        start = perf_counter()
+        mask = self._legal_mask()
+        self._stats.add_time('legal_moves', perf_counter() - start)
+        return mask
+
+    def _legal_mask(self) -> np.ndarray:
+        if self._shape[1] > 64:
+            return _legal_mask(self._board, self.action_space())
+        words = np.array(self._rows, dtype=np.uint64).reshape(-1, 1)
+        return (words & _span_masks(self._shape[1]) != 0).ravel()
+
+    def action_space(self) -> np.ndarray:
+        """ all (row, lower, upper) moves of a board with this shape, see Board """
+        return _action_table(self._shape)
+
+    def winner(self) -> str:
+        """ return winner string if game is over """
+        if self.is_gameover():
+            return 'Player 1' if self._turn else 'Player 2'
+        else:
+            return 'Game not terminated yet!'
+
+    def is_gameover(self) -> bool:
+        """ check if game is over """
+        return not any(self._rows)
+
+    def turn(self) -> bool:
+        """ check whose players turn it is """
+        return self._turn
+
+    def canonical_key(self) -> tuple:
+        """ hashable key of the position, the sorted non-zero row totals, see Board.canonical_key """
+        if self._key is None:
+            self._key = tuple(sorted(bin(mask).count('1') for mask in self._rows if mask))
+        return self._key
+
+    def __hash__(self) -> int:
+        """ hash of the canonical key, equivalent positions share it """
+        return hash(self.canonical_key())
+
+    def __eq__(self, other: object) -> bool:
+        """ two boards are equal if their positions are equivalent, see Board.canonical_key """
+        if not hasattr(other, 'canonical_key'):
+            return NotImplemented
+        return self.canonical_key() == other.canonical_key()
+
+    def __repr__(self) -> str:
+        """ string representation for rendering board in terminal, row by row from a cache """
+        return '\n'.join([_row_text(mask, self._shape[1]) for mask in self._rows])
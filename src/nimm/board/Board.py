@@ -1,6 +1,10 @@
-import itertools
+from time import perf_counter
 import numpy as np
 
+_ACTION_TABLES = {}
+# text of an empty cell and of a straw, as bytes to render whole boards at once
+_GLYPHS = np.frombuffer(b' O  X ', dtype=np.uint8).reshape(2, 3)
+
 
 def _make_board(size: int = 5) -> np.ndarray:
     """ initialise board with size <size> """
@@ -10,26 +14,143 @@ def _make_board(size: int = 5) -> np.ndarray:
     return board[::-1, ::-1]
 
 
+def _action_table(shape: tuple) -> np.ndarray:
+    """
+    all moves (row, lower, upper) with lower <= upper for a board of
+    shape <shape>, ordered by row, then lower, then upper bound.
+    Built once per shape and cached, the returned array is read-only.
+    """
+    shape = tuple(shape)
+    if shape not in _ACTION_TABLES:
+        rows, cols = shape
+        lwr, upr = np.triu_indices(cols)
+        table = np.column_stack([np.repeat(np.arange(rows), len(lwr)),
+                                 np.tile(lwr, rows), np.tile(upr, rows)])
+        table.setflags(write=False)
+        _ACTION_TABLES[shape] = table
+    return _ACTION_TABLES[shape]
+
+
+def _render(board: np.ndarray) -> str:
+    """
+    text of a dense board, ' X ' for a straw and ' O ' for an empty cell,
+    one line per row. Built with one lookup over the whole array.
+    """
+    rows, cols = board.shape
+    text = np.full((rows, 3 * cols + 1), ord('\n'), dtype=np.uint8)
+    text[:, :-1] = _GLYPHS[(board != 0).astype(np.uint8)].reshape(rows, 3 * cols)
+    return text.tobytes()[:-1].decode()
+
+
+def encode_move(shape: tuple, row, lo, hi):
+    """
+    packed index of the move (<row>, <lo>, <hi>) into the action space
+    of a board of shape <shape>, i.e. its row in _action_table(shape).
+    Works on ints and elementwise on arrays.
+    """
+    cols = shape[1]
+    return row * (cols * (cols + 1) // 2) + lo * cols - lo * (lo - 1) // 2 + (hi - lo)
+
+
+def decode_move(shape: tuple, index) -> np.ndarray:
+    """ move (row, lower, upper) of a packed index, or an array of them for an array """
+    return _action_table(shape)[index]
+
+
+def _legal_mask(board: np.ndarray, actions: np.ndarray) -> np.ndarray:
+    """
+    boolean mask over <actions> marking the moves that remove at least
+    one straw, using the row prefix sums of <board> in one vectorised pass.
+    Leading dimensions of <board> are treated as a batch of boards.
+    """
+    csum = np.zeros(board.shape[:-1] + (board.shape[-1] + 1,), dtype=np.int32)
+    np.cumsum(board != 0, axis=-1, out=csum[..., 1:])
+    return csum[..., actions[:, 0], actions[:, 2] + 1] > csum[..., actions[:, 0], actions[:, 1]]
+
+
 class Board:
     """
     Playing Board class for the nimm game.
     Object to interact with when playing the game
+    Moves can also be given as packed indices into the action space,
+    see encode_move. The history of the game is kept as such indices
+    in an array allocated once, every move removes at least one straw.
+    With copy=False the board works on <pos> itself, e.g. a slice of a
+    shared memory block (see SharedPositions). Moves are then written to
+    that buffer, unless it is read-only: the board copies it on the first
+    push instead (copy-on-write). The undo stamps and the history are
+    only allocated on the first push, boards that are only evaluated
+    never hold more than the view.
     """
-    def __init__(self, pos: np.ndarray = None, size: int = 4) -> None:
+    def __init__(self, pos: np.ndarray = None, size: int = 4, copy: bool = True) -> None:
         self.size = size
-        self._moves = []
-        self._board = _make_board(size) if pos is None else pos.copy()
+        if pos is None:
+            self._board = _make_board(size)
+        else:
+            self._board = pos.copy() if copy else pos
+        self._cleared = None
+        self._history = None
+        self._nmoves = 0
         self._turn = True
+        self._key = None
+        self._stats = None
         return None
 
     def reset(self) -> None:
         """ quick reset board to start """
-        self._moves = []
         self._board = _make_board(self.size)
+        self._cleared = None
+        self._nmoves = 0
         self._turn = True
+        self._key = None
+
+    @property
+    def _moves(self) -> list:
+        """ history as a list of [row, (lower, upper)], for compatibility """
+        return [[row, (lo, hi)] for row, lo, hi in self.decode(self.history()).tolist()]
+
+    def _prepare(self) -> None:
+        """
+        before the first push: copy a read-only position and allocate the
+        undo stamps, and the history unless an earlier game left one large enough
+        """
+        if not self._board.flags.writeable:
+            self._board = self._board.copy()
+        self._cleared = np.zeros(self._board.shape, dtype=int)
+        straws = np.count_nonzero(self._board)
+        if self._history is None or len(self._history) < straws:
+            self._history = np.empty(straws, dtype=np.int32)
 
-    def push_mv(self, mv: list) -> bool:
-        """ quick push fcn compatible with legal moves """
+    def history(self) -> np.ndarray:
+        """ packed indices of all moves played so far, read-only view """
+        if self._history is None:
+            return np.empty(0, dtype=np.int32)
+        history = self._history[:self._nmoves]
+        history.setflags(write=False)
+        return history
+
+    def last_move(self) -> list:
+        """ last move played as [row, lower, upper] """
+        if self._nmoves == 0:
+            raise IndexError('no move to take back')
+        return self.decode(self._history[self._nmoves - 1]).tolist()
+
+    def encode(self, row, lo, hi):
+        """ packed index of a move on this board, see encode_move """
+        return encode_move(self._board.shape, row, lo, hi)
+
+    def decode(self, index) -> np.ndarray:
+        """ move (row, lower, upper) of a packed index on this board """
+        return decode_move(self._board.shape, index)
+
+    def instrument(self, stats=None) -> None:
+        """ count pushes and pops and time legal move generation in <stats>, None stops """
+        self._stats = stats
+
+    def push_mv(self, mv) -> bool:
+        """ quick push fcn compatible with legal moves, or a packed index """
+        if isinstance(mv, (int, np.integer)):
+            mv = self.decode(mv)
         return self.push(mv[0], (mv[1], mv[2]))
 
     def push(self, row: int, col: tuple) -> bool:
@@ -52,38 +173,81 @@ class Board:
           1 1 1 0
           0 0 0 0 0
 
+        A move is legal if the range lies on the board
+        and contains at least one straw.
+
         Returns: True if move was processed.
         """
         assert len(col) == 2, 'column argument needs to be tuple with ' + \
             f'length 2, but is: {col}'
-        _lm = self.get_legal_moves()
-        if [row, *col] not in _lm.tolist():
-            raise ValueError(f'Move: {row=} {col=} not in legal moves: {_lm}')
-        assert np.sum(self._board[row, col[0]:col[1] + 1]) > 0, \
-            f'sum of board elements zero: {self._board[row, col[0]:col[1]+1]}'
-        self._board[row, col[0]:col[1] + 1] = 0
-        self._moves.append([row, col])
+        lo, hi = col
+        if not (0 <= row < self._board.shape[0] and 0 <= lo <= hi < self._board.shape[1]):
+            raise ValueError(f'Move: {row=} {col=} is not on the board')
+        if not self._board[row, lo:hi + 1].any():
+            raise ValueError(f'Move: {row=} {col=} does not remove any straw')
+        if self._cleared is None:
+            self._prepare()
+        seg = self._board[row, lo:hi + 1]
+        # remember which straws this move removed, so pop can put them back
+        self._cleared[row, lo:hi + 1][seg != 0] = self._nmoves + 1
+        seg[:] = 0
+        self._history[self._nmoves] = self.encode(row, lo, hi)
+        self._nmoves += 1
         self._turn = not self._turn
-        if self.is_gameover():
-            print('Game Over!')
-            print(f'Winner is: {self.winner()}')
+        self._key = None
+        if self._stats is not None:
+            self._stats.count('push')
         return True
 
-    def get_legal_moves(self) -> list:
+    def pop(self) -> list:
+        """
+        take back the last move pushed on the board and
+        restore the straws it removed.
+
+        Returns: the move as [row, col].
+        """
+        row, lo, hi = self.last_move()
+        stamp = self._cleared[row, lo:hi + 1]
+        removed = stamp == self._nmoves
+        self._board[row, lo:hi + 1][removed] = 1
+        stamp[removed] = 0
+        self._nmoves -= 1
+        self._turn = not self._turn
+        self._key = None
+        if self._stats is not None:
+            self._stats.count('pop')
+        return [row, (lo, hi)]
+
+    def get_legal_moves(self) -> np.ndarray:
         """
-        get all legal moves in the current position as a list.
-        Okay ive overthought this, just get all moves and
-        check if theyre actually changing the board is fast enough.
+        get all legal moves in the current position as an array
+        of (row, lower, upper), see action_space for the ordering.
         """
-        rws = np.linspace(0, self._board.shape[0] - 1,
-                          self._board.shape[0], dtype=int)
-        cls = np.linspace(0, self._board.shape[1] - 1,
-                          self._board.shape[1], dtype=int)
-        mvs = np.array([[rw, lwr, upr] for rw, lwr, upr in itertools.product(
-            rws, cls, cls) if lwr <= upr])
-        msk = np.array([np.sum(self._board[mvs[i, 0], mvs[i, 1]:mvs[i, 2] + 1]) > 0
-                        for i in range(len(mvs))])
-        return mvs[msk]
+        return self.action_space()[self.get_legal_mask()]
+
+    def get_legal_indices(self) -> np.ndarray:
+        """ packed indices of all legal moves, in the order of get_legal_moves """
+        return np.flatnonzero(self.get_legal_mask())
+
+    def get_legal_mask(self) -> np.ndarray:
+        """
+        boolean mask over the fixed action space of the board,
+        True for every move that removes at least one straw.
+        Every legal move query goes through here, so it is timed if instrumented.
+        """
+        if self._stats is None:
+            return _legal_mask(self._board, self.action_space())
+        start = perf_counter()
+        mask = _legal_mask(self._board, self.action_space())
+        self._stats.add_time('legal_moves', perf_counter() - start)
+        return mask
+
+    def action_space(self) -> np.ndarray:
+        """
+        all (row, lower, upper) moves of a board with this shape,
+        legal or not. Shared between boards of equal shape, read-only.
+        """
+        return _action_table(self._board.shape)
 
     def winner(self) -> str:
         """ return winner string if game is over """
@@ -100,10 +264,31 @@ class Board:
         """ check whose players turn it is """
         return self._turn
 
+    def canonical_key(self) -> tuple:
+        """
+        hashable key of the position, equal for positions that only differ
+        by the order of the rows or by where the straws lie within a row:
+        the sorted straw counts of all non-empty rows. A move may reach
+        over empty cells, so a row of n straws can be cut down to any
+        smaller count and to no other, it is a nim heap of n whatever its
+        runs (see nimm.solver.grundy). These are the row totals the
+        tablebase and the trainer rank, without the empty rows.
+        """
+        if self._key is None:
+            totals = np.count_nonzero(self._board, axis=1)
+            self._key = tuple(sorted(totals[totals > 0].tolist()))
+        return self._key
+
+    def __hash__(self) -> int:
+        """ hash of the canonical key, equivalent positions share it """
+        return hash(self.canonical_key())
+
+    def __eq__(self, other: object) -> bool:
+        """ two boards are equal if their positions are equivalent, see canonical_key """
+        if not hasattr(other, 'canonical_key'):
+            return NotImplemented
+        return self.canonical_key() == other.canonical_key()
+
     def __repr__(self) -> str:
         """ string representation for rendering board in terminal """
-        _lst = [''.join([' X ' if self._board[i, j] else ' O '
-                         for j in range(self._board.shape[1])])
-                for i in range(self._board.shape[0])]
-        _str = '\n'.join(_lst)
-        return _str
+        return _render(self._board)
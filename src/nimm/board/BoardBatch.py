@@ -0,0 +1,85 @@
+import numpy as np
+from .Board import Board, _make_board, _action_table, _legal_mask
+
+
+class BoardBatch:
+    """
+    Batch of nimm boards of equal shape, stepped together.
+    Positions are held in one boolean array of shape (n, rows, columns)
+    and moves are indices into the action space shared with
+    Board.action_space, so Board.get_legal_moves and the legal masks
+    of the batch agree.
+    Finished games are reset to the start position after each step
+    unless auto_reset is False.
+    """
+    def __init__(self, n: int, size: int = 4, pos: np.ndarray = None,
+                 auto_reset: bool = True) -> None:
+        self.size = size
+        self._start = (_make_board(size) if pos is None else pos) != 0
+        self._boards = np.repeat(self._start[None], n, axis=0)
+        self._turn = np.ones(n, dtype=bool)
+        self._auto_reset = auto_reset
+        return None
+
+    def __len__(self) -> int:
+        return len(self._boards)
+
+    def reset(self, which: np.ndarray = None) -> None:
+        """ reset all boards, or the ones selected by the mask or indices <which> """
+        which = slice(None) if which is None else which
+        self._boards[which] = self._start
+        self._turn[which] = True
+
+    def action_space(self) -> np.ndarray:
+        """ all (row, lower, upper) moves, indexed by the actions passed to step """
+        return _action_table(self._start.shape)
+
+    def get_legal_masks(self) -> np.ndarray:
+        """ boolean array (n, actions), True for the legal moves of every board """
+        return _legal_mask(self._boards, self.action_space())
+
+    def turn(self) -> np.ndarray:
+        """ whose turn it is on every board, True for Player 1 """
+        return self._turn.copy()
+
+    def board(self, i: int) -> Board:
+        """ copy of board <i> as a single Board """
+        return Board(pos=self._boards[i].astype(float), size=self.size)
+
+    def step(self, actions: np.ndarray) -> tuple:
+        """
+        play one move on every board, given as indices into the action space.
+
+        Returns: legal masks of the new positions, done flags and
+        winners (1 for Player 1, 2 for Player 2, 0 if not finished).
+        With auto_reset the masks belong to the reset boards.
+        """
+        actions = np.asarray(actions)
+        if actions.shape != (len(self),):
+            raise ValueError(f'Expected {len(self)} actions, got shape {actions.shape}')
+        row, lwr, upr = self.action_space()[actions].T
+        cols = np.arange(self._start.shape[1])
+        clear = (cols >= lwr[:, None]) & (cols <= upr[:, None])
+        idx = np.arange(len(self))
+        if not (self._boards[idx, row] & clear).any(axis=1).all():
+            raise ValueError('Actions do not remove any straw on boards: '
+                             f'{np.flatnonzero(~(self._boards[idx, row] & clear).any(axis=1))}')
+        self._boards[idx, row] &= ~clear
+        self._turn = ~self._turn
+
+        done = ~self._boards.any(axis=(1, 2))
+        # the player who took the last straw lost, so the player to move won
+        winner = np.where(done, np.where(self._turn, 1, 2), 0)
+        if self._auto_reset and done.any():
+            self.reset(done)
+        return self.get_legal_masks(), done, winner
+
+    def random_actions(self, rng: np.random.Generator = None,
+                       masks: np.ndarray = None) -> np.ndarray:
+        """
+        one uniformly drawn legal action per board, pass the masks
+        returned by step to avoid computing them again
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        masks = self.get_legal_masks() if masks is None else masks
+        return np.argmax(rng.random(masks.shape) * masks, axis=1)
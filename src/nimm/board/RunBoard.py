@@ -0,0 +1,258 @@
+from bisect import bisect_right
+from itertools import islice
+from math import isqrt
+from time import perf_counter
+import numpy as np
+
+from .Board import _render
+
+
+def _runs_of(row: np.ndarray) -> tuple:
+    """ (starts, stops) of the runs of straws in a dense row, stops exclusive """
+    padded = np.zeros(len(row) + 2, dtype=np.int8)
+    padded[1:-1] = row != 0
+    edges = np.diff(padded)
+    return np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist()
+
+
+class RunBoard:
+    """
+    Playing Board for the nimm game storing every row as sorted runs of
+    straws (start, stop), for boards far larger than a dense array allows.
+    Rows may have any length (<rows>, full of straws), by default the
+    board has the shape of Board and row i holds 2 * i + 1 straws.
+    Pushing a move finds the runs it touches by bisection and splits
+    at most one of them on either side, legal moves are generated
+    lazily (see iter_moves). Packed move indices use the widest row
+    as the number of columns, see encode_move.
+    """
+    def __init__(self, pos: np.ndarray = None, size: int = 4, rows: list = None) -> None:
+        if pos is not None:
+            self._widths = [pos.shape[1]] * pos.shape[0]
+            self._initial = tuple(zip(*[_runs_of(row) for row in pos])) or ((), ())
+        elif rows is not None:
+            self._widths = list(rows)
+            self._initial = ([[0] if w else [] for w in rows], [[w] if w else [] for w in rows])
+        else:
+            self._widths = [2 * size - 1] * size
+            self._initial = ([[0]] * size, [[2 * row + 1] for row in range(size)])
+        self.size = len(self._widths)
+        self._stats = None
+        self.reset()
+        return None
+
+    def reset(self) -> None:
+        """ quick reset board to start """
+        self._starts = [list(starts) for starts in self._initial[0]]
+        self._stops = [list(stops) for stops in self._initial[1]]
+        self._straws = sum(stop - start for starts, stops in zip(self._starts, self._stops)
+                           for start, stop in zip(starts, stops))
+        self._history = []
+        self._undo = []
+        self._turn = True
+        self._key = None
+
+    def instrument(self, stats=None) -> None:
+        """ count pushes and pops and time legal move generation in <stats>, None stops """
+        self._stats = stats
+
+    @property
+    def shape(self) -> tuple:
+        """ number of rows and columns of the widest row """
+        return (self.size, max(self._widths, default=0))
+
+    @property
+    def _board(self) -> np.ndarray:
+        """ dense copy of the position, compatible with Board._board, for small boards only """
+        board = np.zeros(self.shape)
+        for row, (starts, stops) in enumerate(zip(self._starts, self._stops)):
+            for start, stop in zip(starts, stops):
+                board[row, start:stop] = 1
+        return board
+
+    def runs(self, row: int) -> list:
+        """ (start, stop) of the runs of straws in <row>, stop exclusive """
+        return list(zip(self._starts[row], self._stops[row]))
+
+    def row_totals(self) -> list:
+        """ number of straws in every row """
+        return [sum(stops) - sum(starts) for starts, stops in zip(self._starts, self._stops)]
+
+    @property
+    def _moves(self) -> list:
+        """ history as a list of [row, (lower, upper)], for compatibility """
+        return [[row, (lo, hi)] for row, lo, hi in self._history]
+
+    def history(self) -> np.ndarray:
+        """ packed indices of all moves played so far """
+        return np.array([self.encode(*mv) for mv in self._history], dtype=np.int64)
+
+    def last_move(self) -> list:
+        """ last move played as [row, lower, upper] """
+        return list(self._history[-1])
+
+    def encode(self, row: int, lo: int, hi: int) -> int:
+        """ packed index of a move, as encode_move with the widest row as columns """
+        cols = self.shape[1]
+        return row * (cols * (cols + 1) // 2) + lo * cols - lo * (lo - 1) // 2 + (hi - lo)
+
+    def decode(self, index) -> np.ndarray:
+        """ move (row, lower, upper) of a packed index or an array of them, see _decode """
+        if np.ndim(index):
+            return np.array([self._decode(i) for i in index], dtype=int).reshape(-1, 3)
+        return np.array(self._decode(index))
+
+    def _decode(self, index: int) -> list:
+        """ move [row, lower, upper] of a packed index, computed without an action table """
+        cols = self.shape[1]
+        row, rest = divmod(int(index), cols * (cols + 1) // 2)
+        # the moves starting at lo begin at lo * cols - lo * (lo - 1) / 2, invert for lo
+        lo = (2 * cols + 1 - isqrt((2 * cols + 1) ** 2 - 8 * rest)) // 2
+        while lo * cols - lo * (lo - 1) // 2 > rest:
+            lo -= 1
+        while (lo + 1) * cols - (lo + 1) * lo // 2 <= rest:
+            lo += 1
+        return [row, lo, lo + rest - (lo * cols - lo * (lo - 1) // 2)]
+
+    def push_mv(self, mv) -> bool:
+        """ quick push fcn compatible with legal moves, or a packed index """
+        if isinstance(mv, (int, np.integer)):
+            mv = self.decode(mv)
+        return self.push(mv[0], (mv[1], mv[2]))
+
+    def push(self, row: int, col: tuple) -> bool:
+        """
+        push a move given by the row index and the column range,
+        see Board.push. The runs touching the range are found by
+        bisection, the outer two are cut and the inner ones dropped.
+
+        Returns: True if move was processed.
+        """
+        assert len(col) == 2, 'column argument needs to be tuple with ' + \
+            f'length 2, but is: {col}'
+        lo, hi = int(col[0]), int(col[1])
+        if not (0 <= row < self.size and 0 <= lo <= hi < self._widths[row]):
+            raise ValueError(f'Move: {row=} {col=} is not on the board')
+        starts, stops = self._starts[row], self._stops[row]
+        first = bisect_right(stops, lo)
+        last = bisect_right(starts, hi)
+        if first >= last:
+            raise ValueError(f'Move: {row=} {col=} does not remove any straw')
+        old_starts, old_stops = starts[first:last], stops[first:last]
+        new_starts, new_stops = [], []
+        if old_starts[0] < lo:
+            new_starts.append(old_starts[0])
+            new_stops.append(lo)
+        if old_stops[-1] > hi + 1:
+            new_starts.append(hi + 1)
+            new_stops.append(old_stops[-1])
+        starts[first:last], stops[first:last] = new_starts, new_stops
+        removed = sum(old_stops) - sum(old_starts) - sum(new_stops) + sum(new_starts)
+        self._straws -= removed
+        self._undo.append((first, len(new_starts), old_starts, old_stops, removed))
+        self._history.append((row, lo, hi))
+        self._turn = not self._turn
+        self._key = None
+        if self._stats is not None:
+            self._stats.count('push')
+        return True
+
+    def pop(self) -> list:
+        """
+        take back the last move pushed on the board and
+        restore the runs it cut.
+
+        Returns: the move as [row, col].
+        """
+        row, lo, hi = self._history.pop()
+        first, added, old_starts, old_stops, removed = self._undo.pop()
+        self._starts[row][first:first + added] = old_starts
+        self._stops[row][first:first + added] = old_stops
+        self._straws += removed
+        self._turn = not self._turn
+        self._key = None
+        if self._stats is not None:
+            self._stats.count('pop')
+        return [row, (lo, hi)]
+
+    def iter_moves(self, distinct: bool = False):
+        """
+        generate the legal moves lazily as (row, lower, upper), in the order
+        of Board.get_legal_moves. With <distinct> only ranges from straw to
+        straw are generated, wider ranges remove the same straws. Either
+        way nothing is generated for a row until the previous one is done.
+        """
+        for row, (starts, stops) in enumerate(zip(self._starts, self._stops)):
+            if not starts:
+                continue
+            width = self._widths[row]
+            if distinct:
+                for i, (start, stop) in enumerate(zip(starts, stops)):
+                    for lo in range(start, stop):
+                        for j in range(i, len(starts)):
+                            for hi in range(max(lo, starts[j]), stops[j]):
+                                yield row, lo, hi
+                continue
+            for lo in range(width):
+                i = bisect_right(stops, lo)
+                if i == len(starts):
+                    break
+                for hi in range(max(lo, starts[i]), width):
+                    yield row, lo, hi
+
+    def get_legal_moves(self, limit: int = None) -> np.ndarray:
+        """
+        legal moves as an array of (row, lower, upper) like Board.get_legal_moves,
+        the first <limit> only if given. There are quadratically many in the
+        row length, use iter_moves on large boards.
+        """
+        if self._stats is None:
+            return np.array(list(islice(self.iter_moves(), limit)), dtype=int).reshape(-1, 3)
+        start = perf_counter()
+        mvs = np.array(list(islice(self.iter_moves(), limit)), dtype=int).reshape(-1, 3)
+        self._stats.add_time('legal_moves', perf_counter() - start)
+        return mvs
+
+    def get_legal_indices(self) -> np.ndarray:
+        """ packed indices of all legal moves, in the order of get_legal_moves, timed as those """
+        if self._stats is None:
+            return np.array([self.encode(*mv) for mv in self.iter_moves()], dtype=np.int64)
+        start = perf_counter()
+        idx = np.array([self.encode(*mv) for mv in self.iter_moves()], dtype=np.int64)
+        self._stats.add_time('legal_moves', perf_counter() - start)
+        return idx
+
+    def winner(self) -> str:
+        """ return winner string if game is over """
+        if self.is_gameover():
+            return 'Player 1' if self._turn else 'Player 2'
+        else:
+            return 'Game not terminated yet!'
+
+    def is_gameover(self) -> bool:
+        """ check if game is over """
+        return self._straws == 0
+
+    def turn(self) -> bool:
+        """ check whose players turn it is """
+        return self._turn
+
+    def canonical_key(self) -> tuple:
+        """ hashable key of the position, the sorted non-zero row totals, see Board.canonical_key """
+        if self._key is None:
+            self._key = tuple(sorted(total for total in self.row_totals() if total))
+        return self._key
+
+    def __hash__(self) -> int:
+        """ hash of the canonical key, equivalent positions share it """
+        return hash(self.canonical_key())
+
+    def __eq__(self, other: object) -> bool:
+        """ two boards are equal if their positions are equivalent, see Board.canonical_key """
+        if not hasattr(other, 'canonical_key'):
+            return NotImplemented
+        return self.canonical_key() == other.canonical_key()
+
+    def __repr__(self) -> str:
+        """ string representation for rendering board in terminal """
+        return _render(self._board)
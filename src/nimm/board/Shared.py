@@ -0,0 +1,98 @@
+"""
+Positions shared between processes without pickling them.
+
+SharedPositions copies an array of positions into a shared memory block
+once. Pickling it only sends the name of the block, so pool workers map
+the same memory and read positions as zero-copy, read-only views ::
+
+  with SharedPositions(positions) as shared:
+      winning = shared.map(nimm.solver.is_winning, processes=8)
+"""
+import sys
+from multiprocessing import Pool, shared_memory
+import numpy as np
+
+from .Board import Board
+
+# blocks attached in this process, by name, so each worker maps a block once
+_ATTACHED = {}
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    map the shared memory block <name>, the creating process owns and
+    unlinks it. Pool workers share the resource tracker of their parent,
+    so attaching registers nothing new before Python 3.13 either.
+    """
+    if name not in _ATTACHED:
+        kwargs = {'track': False} if sys.version_info >= (3, 13) else {}
+        _ATTACHED[name] = shared_memory.SharedMemory(name=name, **kwargs)
+    return _ATTACHED[name]
+
+
+class SharedPositions:
+    """
+    Array of positions of shape (n, rows, columns) published in shared
+    memory. The creating process owns the block and unlinks it on close,
+    other processes attach to it when the object is unpickled. Positions
+    are read-only views, boards built from them copy on the first push.
+    """
+    def __init__(self, positions: np.ndarray = None, *, _name: str = None,
+                 _shape: tuple = None, _dtype: str = None) -> None:
+        if _name is None:
+            positions = np.ascontiguousarray(positions)
+            self._shm = shared_memory.SharedMemory(create=True, size=max(positions.nbytes, 1))
+            self._owner = True
+            self.positions = np.ndarray(positions.shape, dtype=positions.dtype,
+                                        buffer=self._shm.buf)
+            self.positions[...] = positions
+        else:
+            self._shm = _attach(_name)
+            self._owner = False
+            self.positions = np.ndarray(_shape, dtype=_dtype, buffer=self._shm.buf)
+        self.positions.setflags(write=False)
+        return None
+
+    def __reduce__(self) -> tuple:
+        """ pickle by name, the receiving process attaches to the block """
+        return (_unpickle, (self._shm.name, self.positions.shape, self.positions.dtype.str))
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def board(self, i: int) -> Board:
+        """ Board on position <i> without copying it, see Board(copy=False) """
+        return Board(pos=self.positions[i], size=self.positions.shape[1], copy=False)
+
+    def map(self, fcn, processes: int = None, chunk: int = 1024) -> np.ndarray:
+        """
+        evaluate fcn(board) for every position on a process pool. Every task
+        only carries the block name and a slice, <fcn> must be picklable.
+        """
+        tasks = [(self, fcn, start, min(start + chunk, len(self)))
+                 for start in range(0, len(self), chunk)]
+        with Pool(processes) as pool:
+            return np.concatenate(pool.map(_map_slice, tasks) or [np.empty(0)])
+
+    def close(self) -> None:
+        """ drop the mapping, the owner also frees the block """
+        self.positions = None
+        if self._owner:
+            self._shm.close()
+            self._shm.unlink()
+
+    def __enter__(self) -> 'SharedPositions':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _unpickle(name: str, shape: tuple, dtype: str) -> SharedPositions:
+    return SharedPositions(_name=name, _shape=shape, _dtype=dtype)
+
+
+def _map_slice(task: tuple) -> np.ndarray:
+    """ worker: evaluate fcn on the boards of one slice of the shared positions """
+    shared, fcn, start, stop = task
+    return np.array([fcn(shared.board(i)) for i in range(start, stop)])
@@ -1 +1,12 @@
-from .Board import Board
+from .Board import Board, encode_move, decode_move
+from .BitBoard import BitBoard
+from .BoardBatch import BoardBatch
+from .RunBoard import RunBoard
+
+
+def __getattr__(name: str):
+    """ import the shared memory helper only when it is used, multiprocessing is slow to import """
+    if name == 'SharedPositions':
+        from .Shared import SharedPositions
+        return SharedPositions
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -0,0 +1,340 @@
+import os
+import copy
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+import tkinter as tk
+from PIL import Image, ImageTk
+from glob import glob
+import numpy as np
+
+from ..board import Board
+from ..player import Player, PlayerHuman, PlayerComputer
+
+_BACKGROUNDS = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'backgrounds')
+
+
+@lru_cache(maxsize=None)
+def _background_files() -> tuple:
+    """ background images shipped with the package """
+    return tuple(sorted(glob(f'{_BACKGROUNDS}/*jpg')))
+
+
+@lru_cache(maxsize=None)
+def _load_image(path: str, size: tuple, cache_dir: str = None) -> Image.Image:
+    """
+    decode and resize an image once per process. With <cache_dir>
+    the resized thumbnail is also kept on disk and reused by later
+    processes as long as it is newer than the image.
+    """
+    if cache_dir is not None:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        thumb = os.path.join(cache_dir, f'{stem}_{size[0]}x{size[1]}.png')
+        if os.path.exists(thumb) and os.path.getmtime(thumb) >= os.path.getmtime(path):
+            with Image.open(thumb) as image:
+                image.load()
+                return image
+    with Image.open(path) as image:
+        image = image.resize(size)
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        image.save(thumb)
+    return image
+
+
+class NimmGUI(tk.Frame):
+    """
+    Game with GUI (to be used with one of the play functions)
+    Background images are decoded and resized once per process,
+    optionally through an on-disk thumbnail cache in <cache_dir>.
+    Computer players search a snapshot of the board on a worker thread,
+    the window polls for their move and stays responsive meanwhile.
+    """
+    def __init__(self, root: tk.Tk, p1: Player,
+                 p2: Player, board: Board, cache_dir: str = None) -> None:
+        self._p1 = p1
+        self._p2 = p2
+        self._board = board
+        self._clicked_buttons = []
+        self._cache_dir = cache_dir
+        self._photos = {}
+        self._buttons = []
+        self._widgets = []
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._future = None
+        self._generation = 0
+        self.window = root
+        self.window.protocol('WM_DELETE_WINDOW', self._close)
+
+        self._setup_window()
+
+    def _set_state(self, i: int, j: int, enabled: bool) -> None:
+        """ enable or disable a board button, touching the widget only if it changes """
+        if self._enabled[i, j] != enabled:
+            self._enabled[i, j] = enabled
+            self._buttons[i * self._enabled.shape[1] + j]['state'] = \
+                'normal' if enabled else 'disabled'
+
+    def _enable_straws(self) -> None:
+        """ enable the buttons of the straws left on the board and disable all others """
+        straws = self._board._board != 0
+        for i, j in itertools.product(*map(range, straws.shape)):
+            self._set_state(i, j, bool(straws[i, j]))
+
+    def _click_buttons(self, move: list) -> None:
+        """ disable the buttons of the straws removed by <move> """
+        if not len(move):
+            return None
+        row = move[0]
+        start, stop = move[1:]
+        for j in np.flatnonzero(self._enabled[row, start:stop + 1]):
+            self._set_state(row, start + j, False)
+        return None
+
+    def _clicked(self, i, j) -> None:
+        """ save and disable the button """
+        if self._future is not None:
+            return None
+        self._clicked_buttons.append([i, j])
+        self._set_state(i, j, False)
+        return None
+
+    def _popup_error(self) -> None:
+        window = tk.Toplevel()
+        window.wm_title('Illegal Move!')
+        rows = np.array([pair[0] for pair in self._clicked_buttons])
+        label = tk.Label(window, text=f'You may only choose one row at a time but chose: {rows}')
+        label.grid(row=0, column=0)
+        btn = tk.Button(window, text='Alright!', command=window.destroy)
+        btn.grid(row=0, column=1)
+
+    def _popup_failure(self, err: Exception) -> None:
+        """ tell the user that the computer player failed to move """
+        window = tk.Toplevel()
+        window.wm_title('Computer Move Failed!')
+        label = tk.Label(window, text=f'The computer player failed: {type(err).__name__}: {err}')
+        label.grid(row=0, column=0)
+        btn = tk.Button(window, text='Alright!', command=window.destroy)
+        btn.grid(row=0, column=1)
+
+    def _build_window(self) -> None:
+        """
+        creates all buttons and texts depending on size of playing
+        board, only once. Replays reset them in _setup_window.
+        """
+        for widget in self._widgets:
+            widget.destroy()
+        rows, columns = self._board._board.shape
+        msize = int(1150 / columns)
+        self.player_turn = tk.Label(text='Player 1 Turn')
+        self.player_turn.grid(row=0, column=2)
+        self._submit_button = tk.Button(text='Submit Selection', width=20,
+                                        height=4, bg='white', fg='black',
+                                        command=self._submit)
+        self._submit_button.grid(row=0, column=int(columns / 2))
+        self._winner = tk.Label(text='')
+        self._replay = tk.Button(text='Replay', width=20, height=4,
+                                 bg='white', fg='black',
+                                 command=self._setup_window)
+
+        self._buttons = []
+        self._images = self._background_images((msize, int(msize * 1.5)))
+        for i, j in itertools.product(range(rows), range(columns)):
+            _button = tk.Button(self.window, width=msize, height=int(msize * 1.5),
+                                bd=0, command=lambda i=i, j=j: self._clicked(i, j))
+            if not (j > i * 2):
+                _button.grid(row=i + 1, column=j + rows - i - 1)
+            self._buttons.append(_button)
+        self._enabled = np.ones((rows, columns), dtype=bool)
+        self._widgets = self._buttons + [self.player_turn, self._submit_button,
+                                         self._winner, self._replay]
+        return None
+
+    def _setup_window(self) -> None:
+        """
+        resets the board and the window for a new game, the
+        widgets are only created the first time
+        """
+        self._cancel()
+        self._board.reset()
+        if not self._buttons or self._enabled.shape != self._board._board.shape:
+            self._build_window()
+        self._clicked_buttons.clear()
+        self.player_turn.config(text='Player 1 Turn')
+        self._submit_button['state'] = 'normal'
+        self._winner.grid_remove()
+        self._replay.grid_remove()
+        for i, j in itertools.product(*map(range, self._enabled.shape)):
+            self._set_state(i, j, True)
+            self._buttons[i * self._enabled.shape[1] + j]['image'] = \
+                np.random.choice(self._images)
+        return None
+
+    def _background_images(self, size: tuple) -> list:
+        """ PhotoImages of all backgrounds at <size>, reused on replay """
+        if size not in self._photos:
+            self._photos[size] = [ImageTk.PhotoImage(_load_image(ff, size, self._cache_dir))
+                                  for ff in _background_files()]
+        return self._photos[size]
+
+    def _submit(self) -> None:
+        """ submit the move you have selected, action will be taken on button press """
+        player = self._p1 if self._board.turn() else self._p2
+        if not player.is_human():
+            self._think(player)
+            return None
+        rows = np.array([pair[0] for pair in self._clicked_buttons])
+        cols = np.sort([pair[1] for pair in self._clicked_buttons])
+        assert len(self._clicked_buttons), 'Please select buttons. '
+        if not np.all(rows == rows[0]):
+            print(f'Error, you may only choose from one row! {rows}')
+            self._unclick_buttons()
+            return None
+        self._after_move(player.push_gui([rows[0], cols[0], cols[-1]]))
+        return None
+
+    def _think(self, player: Player) -> None:
+        """
+        let a computer player search on the worker thread and poll for its
+        move. The worker searches a copy of the player on a snapshot of the
+        board, so a reset of the live board never races with the search.
+        """
+        thinker = copy.copy(player)
+        thinker._board = Board(pos=self._board._board)
+        self._future = self._executor.submit(thinker.choose_move)
+        self._submit_button['state'] = 'disabled'
+        for i, j in itertools.product(*map(range, self._enabled.shape)):
+            self._set_state(i, j, False)
+        turntext = 'Player 1' if self._board.turn() else 'Player 2'
+        self.player_turn.config(text=f'{turntext} thinking...')
+        self.window.after(50, self._poll, self._generation)
+        return None
+
+    def _poll(self, generation: int) -> None:
+        """ apply the computer move once it is found, unless the game was reset meanwhile """
+        if generation != self._generation:
+            return None
+        if not self._future.done():
+            self.window.after(50, self._poll, generation)
+            return None
+        future, self._future = self._future, None
+        self._submit_button['state'] = 'normal'
+        self._enable_straws()
+        try:
+            mv = future.result()
+            self._board.push_mv(mv)
+        except Exception as err:
+            # keep the window usable, the move can be retried with submit
+            turntext = 'Player 1' if self._board.turn() else 'Player 2'
+            self.player_turn.config(text=f'{turntext} Turn')
+            self._popup_failure(err)
+            return None
+        self._after_move([int(mv[0]), int(mv[1]), int(mv[2])])
+        return None
+
+    def _after_move(self, mv: list) -> None:
+        """ update the window after a move was pushed on the board """
+        self._click_buttons(mv)
+        turntext = 'Player 1 Turn' if self._board.turn() else 'Player 2 Turn'
+        self.player_turn.config(text=turntext)
+        if self._board.is_gameover():
+            self._winner.config(text=f'Winner is {self._board.winner()}')
+            self._winner.grid(row=0, column=4)
+            self._replay.grid(row=0, column=5)
+        self._clicked_buttons.clear()
+        return None
+
+    def _cancel(self) -> None:
+        """
+        drop a pending computer move, its result is ignored once it finishes.
+        A search that already runs cannot be stopped, it is left to finish on
+        the old worker and the next search gets a fresh one.
+        """
+        self._generation += 1
+        if self._future is not None:
+            if not self._future.cancel():
+                self._executor.shutdown(wait=False)
+                self._executor = ThreadPoolExecutor(max_workers=1)
+            self._future = None
+
+    def _close(self) -> None:
+        """ cancel pending searches and close the window """
+        self._cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.window.destroy()
+
+    def _unclick_buttons(self) -> None:
+        self._popup_error()
+        for i, j in self._clicked_buttons:
+            self._set_state(i, j, True)
+        self._clicked_buttons.clear()
+
+
+def play_1v1(cache_dir: str = None):
+    root = tk.Tk()
+    root.title('NIMM')
+    root.geometry('1200x1200')
+
+    board = Board()
+    p1 = PlayerHuman(board)
+    p2 = PlayerHuman(board, start=False)
+
+    NimmGUI(root, p1, p2, board, cache_dir=cache_dir)
+
+    root.mainloop()
+
+
+def play_gui(cache_dir: str = None):
+    root = tk.Tk()
+    root.title('NIMM')
+    root.geometry('1200x1200')
+
+    board = Board()
+
+    player_opts = ['human', 'computer']
+
+    p1_cls_str = tk.StringVar(root)
+    p1_cls_str.set(player_opts[0])
+    p1_menu = tk.OptionMenu(root, p1_cls_str, *player_opts)
+    p1_menu.grid(row=0, column=0)
+
+    p2_cls_str = tk.StringVar(root)
+    p2_cls_str.set(player_opts[1])
+    p2_menu = tk.OptionMenu(root, p2_cls_str, *player_opts)
+    p2_menu.grid(row=1, column=0)
+
+    player_classes = {'human': PlayerHuman, 'computer': PlayerComputer}
+
+    dfcs = [int(i) for i in range(10)]
+    dfc1 = tk.IntVar(root)
+    dfc1.set(dfcs[0])
+    dfc1_menu = tk.OptionMenu(root, dfc1, *dfcs)
+    dfc1_menu.grid(row=0, column=1)
+
+    dfc2 = tk.IntVar(root)
+    dfc2.set(dfcs[0])
+    dfc2_menu = tk.OptionMenu(root, dfc2, *dfcs)
+    dfc2_menu.grid(row=1, column=1)
+
+    def startfcn() -> None:
+        p1fcn = partial(player_classes[p1_cls_str.get()], board=board, start=True,
+                        difficulty=dfc1.get())
+        p2fcn = partial(player_classes[p2_cls_str.get()], board=board, start=False,
+                        difficulty=dfc2.get())
+        p1_menu.grid_remove()
+        p2_menu.grid_remove()
+        dfc1_menu.grid_remove()
+        dfc2_menu.grid_remove()
+        start_button.grid_remove()
+        p1 = p1fcn()
+        p2 = p2fcn()
+
+        print(p1, p1.is_human(), p1.is_turn())
+        print(p2, p2.is_human(), p2.is_turn())
+
+        NimmGUI(root, p1, p2, board, cache_dir=cache_dir)
+
+    start_button = tk.Button(text='Start Game', command=startfcn)
+    start_button.grid(row=0, column=2)
+
+    root.mainloop()
@@ -0,0 +1,185 @@
+"""
+Binary log of finished nimm games.
+
+The file starts with a fixed header, followed by the player configs
+as JSON. Then the games follow back to back, each as a small record
+header with the number of moves and the winner, followed by its moves
+as packed indices into the action space (see nimm.board.encode_move) ::
+
+  with GameLogWriter('games.ngl', size=4, players={'p1': 'computer:0'}) as log:
+      Game(p1, p2, board, observers=[log], headless=True).play()
+
+  reader = GameLogReader('games.ngl')
+  reader.win_rate_by_opening()
+
+The writer only appends, so logs of several runs can be collected in
+one file. The reader memory maps the file and never loads it at once.
+"""
+import json
+import os
+from itertools import chain
+import numpy as np
+
+from ..board import decode_move
+from .Observer import Observer
+
+_MAGIC = b'NIMMGL02'
+_HEADER = np.dtype([('magic', 'S8'), ('size', '<u4'), ('move_bytes', '<u4'), ('meta', '<u8')])
+# game record of every format version, version 1 counted the moves in two bytes
+_GAMES = {b'NIMMGL01': np.dtype([('moves', '<u2'), ('winner', 'u1'), ('reserved', 'u1')]),
+          b'NIMMGL02': np.dtype([('moves', '<u4'), ('winner', 'u1'), ('reserved', 'u1')])}
+
+
+def _move_dtype(size: int) -> np.dtype:
+    """ smallest unsigned dtype holding every packed move of a board of size <size> """
+    cols = 2 * size - 1
+    return np.dtype('<u2' if size * cols * (cols + 1) // 2 <= 1 << 16 else '<u4')
+
+
+def _read_header(data: np.ndarray) -> tuple:
+    """
+    (size, move dtype, game record dtype, player configs, offset of the
+    first game) of a mapped log
+    """
+    if len(data) < _HEADER.itemsize:
+        raise ValueError('file is not a nimm game log')
+    header = data[:_HEADER.itemsize].view(_HEADER)[0]
+    if header['magic'] not in _GAMES:
+        raise ValueError('file is not a nimm game log')
+    start = _HEADER.itemsize + int(header['meta'])
+    players = json.loads(bytes(data[_HEADER.itemsize:start]).decode()) if header['meta'] else {}
+    return int(header['size']), np.dtype(f'<u{int(header["move_bytes"])}'), \
+        _GAMES[bytes(header['magic'])], players, start
+
+
+class GameLogWriter(Observer):
+    """
+    Append-only writer of a game log, and an observer of Game: every
+    finished game is written when the game is over. Moves can also
+    be written directly with write. An existing log is appended to if
+    it was written for the same board size.
+    """
+    def __init__(self, path: str, size: int, players: dict = None) -> None:
+        self.path = path
+        self.size = size
+        self._dtype = _move_dtype(size)
+        if os.path.exists(path) and os.path.getsize(path):
+            log_size, _, self._game, self.players, _ = \
+                _read_header(np.memmap(path, dtype=np.uint8, mode='r'))
+            if log_size != size:
+                raise ValueError(f'{path} logs games of size {log_size}, not {size}')
+            self._fh = open(path, 'ab')
+        else:
+            self._game = _GAMES[_MAGIC]
+            self.players = players or {}
+            meta = json.dumps(self.players).encode() if self.players else b''
+            header = np.zeros(1, dtype=_HEADER)
+            header['magic'], header['size'] = _MAGIC, size
+            header['move_bytes'], header['meta'] = self._dtype.itemsize, len(meta)
+            self._fh = open(path, 'wb')
+            self._fh.write(header.tobytes() + meta)
+        return None
+
+    def write(self, moves: np.ndarray, winner: int) -> None:
+        """ append one game given by its packed moves and winner (1 or 2) """
+        if len(moves) > np.iinfo(self._game['moves']).max:
+            raise ValueError(f'a game of {len(moves)} moves does not fit the records of {self.path}')
+        record = np.zeros(1, dtype=self._game)
+        record['moves'], record['winner'] = len(moves), winner
+        self._fh.write(record.tobytes() + np.asarray(moves, dtype=self._dtype).tobytes())
+
+    def on_gameover(self, board, winner: str, elapsed: float) -> None:
+        self.write(board.history(), 1 if board.turn() else 2)
+
+    def close(self) -> None:
+        """ flush and close the file """
+        self._fh.close()
+
+    def __enter__(self) -> 'GameLogWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class GameLogReader:
+    """
+    Reader of a game log written by GameLogWriter. The file is memory
+    mapped, games are parsed when they are iterated over and the
+    analytics work on arrays gathered straight from the mapping.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._data = np.memmap(path, dtype=np.uint8, mode='r')
+        self.size, self._dtype, self._game, self.players, self._start = \
+            _read_header(self._data)
+        self._shape = (self.size, 2 * self.size - 1)
+        self._offsets = None
+
+    def _scan(self):
+        """ yield (byte offset of the moves, number of moves, winner) of every game """
+        buf, pos = memoryview(self._data), self._start
+        wide = self._game['moves'].itemsize == 4
+        while pos < len(buf):
+            nmoves = buf[pos] | buf[pos + 1] << 8
+            if wide:
+                nmoves |= buf[pos + 2] << 16 | buf[pos + 3] << 24
+            pos += self._game.itemsize
+            yield pos, nmoves, buf[pos - 2]
+            pos += nmoves * self._dtype.itemsize
+
+    def __iter__(self):
+        """ yield every game lazily as (winner, packed moves), the moves are views of the file """
+        buf = memoryview(self._data)
+        for offset, nmoves, winner in self._scan():
+            yield winner, np.frombuffer(buf, dtype=self._dtype, count=nmoves, offset=offset)
+
+    def _index(self) -> tuple:
+        """ byte offsets, move counts and winners of all games, scanned once """
+        if self._offsets is None:
+            index = np.fromiter(chain.from_iterable(self._scan()), dtype=np.int64).reshape(-1, 3)
+            self._offsets, self._lengths, self._winners = index.T
+        return self._offsets, self._lengths, self._winners
+
+    def __len__(self) -> int:
+        return len(self._index()[0])
+
+    def __getitem__(self, i: int) -> tuple:
+        """ game <i> as (winner, packed moves) """
+        offsets, lengths, winners = self._index()
+        return int(winners[i]), np.frombuffer(memoryview(self._data), dtype=self._dtype,
+                                              count=int(lengths[i]), offset=int(offsets[i]))
+
+    def _gather(self, positions: np.ndarray) -> np.ndarray:
+        """ packed moves stored at the byte <positions>, read little-endian """
+        moves = np.zeros(len(positions), dtype=np.int64)
+        for byte in range(self._dtype.itemsize):
+            moves |= self._data[positions + byte].astype(np.int64) << (8 * byte)
+        return moves
+
+    def arrays(self) -> tuple:
+        """
+        all games as arrays: winners, number of moves and the packed
+        moves of all games concatenated, split them with np.cumsum
+        of the numbers of moves.
+        """
+        offsets, lengths, winners = self._index()
+        first = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = np.repeat(offsets, lengths) + \
+            (np.arange(lengths.sum()) - first) * self._dtype.itemsize
+        return winners.copy(), lengths.copy(), self._gather(positions)
+
+    def openings(self) -> np.ndarray:
+        """ packed first move of every game """
+        offsets, lengths, _ = self._index()
+        return self._gather(offsets[lengths > 0])
+
+    def win_rate_by_opening(self) -> dict:
+        """ (games, win rate of Player 1) for every opening move played, keyed by (row, lo, hi) """
+        _, lengths, winners = self._index()
+        openings = self.openings()
+        games = np.bincount(openings)
+        wins = np.bincount(openings, weights=winners[lengths > 0] == 1)
+        return {tuple(decode_move(self._shape, index).tolist()):
+                (int(games[index]), float(wins[index] / games[index]))
+                for index in np.flatnonzero(games)}
@@ -0,0 +1,69 @@
+from .Renderer import Renderer
+
+
+class Observer:
+    """
+    Base class for observers of a Game. Override the hooks
+    for the events you are interested in, all default to no-ops.
+    """
+    def on_start(self, board) -> None:
+        """ called once before the first move """
+        return None
+
+    def on_move(self, board, player: int, move: list, elapsed: float) -> None:
+        """
+        called after every move with the player who moved (1 or 2),
+        the move as [row, lo, hi] and the time taken to choose it in seconds
+        """
+        return None
+
+    def on_gameover(self, board, winner: str, elapsed: float) -> None:
+        """ called once when the game is over with the total time of the game """
+        return None
+
+
+class TerminalObserver(Observer):
+    """
+    Print the game to the terminal: the starting position,
+    every move with the board after it and the winner.
+    With <live> the board is redrawn in place and with <fps> at most
+    that many frames per second are drawn, see Renderer. Live
+    drawing suits headless games, nothing else may print meanwhile.
+    """
+    def __init__(self, live: bool = False, fps: float = None, stream=None) -> None:
+        self._renderer = Renderer(stream, live, fps)
+        self._live = live
+
+    def on_start(self, board) -> None:
+        print('Starting Position for nimm game: ', file=self._renderer._stream)
+        self._renderer.reset()
+        self._renderer.draw(board, force=True)
+
+    def on_move(self, board, player: int, move: list, elapsed: float) -> None:
+        if not self._live:
+            print(f'Playing move: {move}', file=self._renderer._stream)
+        self._renderer.draw(board)
+
+    def on_gameover(self, board, winner: str, elapsed: float) -> None:
+        if self._renderer.pending:
+            self._renderer.draw(board, force=True)
+        print(f'Winner is: {winner}', file=self._renderer._stream)
+
+
+class EventLog(Observer):
+    """
+    Keep every event of a game as a dict, e.g. to
+    analyse the move timings after the game.
+    """
+    def __init__(self) -> None:
+        self.events = []
+
+    def on_start(self, board) -> None:
+        self.events.append({'event': 'start'})
+
+    def on_move(self, board, player: int, move: list, elapsed: float) -> None:
+        self.events.append({'event': 'move', 'player': player,
+                            'move': move, 'elapsed': elapsed})
+
+    def on_gameover(self, board, winner: str, elapsed: float) -> None:
+        self.events.append({'event': 'gameover', 'winner': winner, 'elapsed': elapsed})
@@ -0,0 +1,60 @@
+import sys
+from time import perf_counter
+import numpy as np
+
+from ..board.Board import _render
+
+
+class Renderer:
+    """
+    Terminal renderer for boards, see Board.__repr__ for the text.
+    With <live> the board is drawn once and later frames only rewrite
+    the rows that changed, moving the cursor with ANSI escape codes,
+    so nothing else may be printed between frames. With <fps> frames
+    requested faster than that are skipped and pending is set, the
+    next frame drawn catches up on all changes.
+    """
+    def __init__(self, stream=None, live: bool = False, fps: float = None) -> None:
+        """ draw to <stream>, by default to the sys.stdout of the moment """
+        self._stream = stream
+        self._live = live
+        self._interval = 0. if not fps else 1. / fps
+        self._next = 0.
+        self._shown = None
+        self.frames = 0
+        self.skipped = 0
+        self.pending = False
+
+    def draw(self, board, force: bool = False) -> bool:
+        """ draw the board unless the frame rate is exceeded, True if it was drawn """
+        now = perf_counter()
+        if now < self._next and not force:
+            self.skipped += 1
+            self.pending = True
+            return False
+        self._next = now + self._interval
+        straws = board._board != 0
+        stream = sys.stdout if self._stream is None else self._stream
+        if not self._live or self._shown is None or self._shown.shape != straws.shape:
+            stream.write(_render(straws) + '\n')
+        else:
+            stream.write(self._redraw(straws))
+        stream.flush()
+        self._shown = straws
+        self.frames += 1
+        self.pending = False
+        return True
+
+    def _redraw(self, straws: np.ndarray) -> str:
+        """ escape codes and text rewriting the rows that differ from the last frame """
+        out = []
+        for row in np.flatnonzero((straws != self._shown).any(axis=1)):
+            # the cursor waits below the board, go up to the row and back down after it
+            up = len(straws) - row
+            out.append(f'\x1b[{up}F{_render(straws[row:row + 1])}\x1b[{up}E')
+        return ''.join(out)
+
+    def reset(self) -> None:
+        """ forget the last frame, the next one is drawn in full """
+        self._shown = None
+        self._next = 0.
@@ -1 +1,14 @@
-from .Game import Game, play_1v1, play_gui
+from .Game import Game
+from .Observer import Observer, TerminalObserver, EventLog
+from .GameLog import GameLogWriter, GameLogReader
+from .Renderer import Renderer
+
+_GUI = ('NimmGUI', 'play_1v1', 'play_gui')
+
+
+def __getattr__(name: str):
+    """ import the Tk GUI only when it is used, so headless imports stay light """
+    if name in _GUI:
+        from . import GUI
+        return getattr(GUI, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,6 +1,7 @@
-from time import sleep
+from time import perf_counter
 import numpy as np
 from ..board import Board
+from ..solver import Tablebase
 
 
 class Player:
@@ -47,7 +48,6 @@ class PlayerHuman:
             mv = mv.replace('[', '').replace(']', '').split(',')
             row = int(mv[0])
             col = (int(mv[1]), int(mv[2]))
-            print(f'Playing move: {row} {col}')
             self._board.push(row, col)
         else:
             print('Its not your turn to move!')
@@ -66,31 +66,40 @@ class PlayerHuman:
 class PlayerComputer:
     """
     Computer Player for the nimm game.
+    Given a tablebase (see nimm.solver.Tablebase) or its path,
+    covered positions are looked up instead of searched.
+    Random choices are drawn from <rng>, by default from the
+    global numpy random state.
     """
     def __init__(self, board: Board, name: str = 'Humy',
-                 start: bool = True, difficulty: int = 0) -> None:
+                 start: bool = True, difficulty: int = 0,
+                 tablebase=None, rng: np.random.Generator = None) -> None:
         """ init for the computer nimm player """
         self._name = name
         self._turn = start
         self._board = board
         self._difficulty = difficulty
-        self._pad = len(np.binary_repr(board._board.shape[1]))
         self._human = False
+        self._tablebase = Tablebase(tablebase) if isinstance(tablebase, str) else tablebase
+        self._rng = np.random if rng is None else rng
+        self._stats = None
 
     def is_human(self) -> bool:
         """ check if player is human or not """
         return self._human
 
+    def instrument(self, stats=None) -> None:
+        """ time decisions and count candidate moves in <stats>, None stops """
+        self._stats = stats
+
     def is_turn(self) -> bool:
         """ check if its your turn to play """
         return self._board.turn() == self._turn
 
     def push(self) -> list:
-        """ push a move chosen by the _choose_move function """
-        sleep(2)
+        """ push a move chosen by the choose_move function """
         if self.is_turn():
-            mv = self._choose_move()
-            print(f'Playing move: {mv}')
+            mv = self.choose_move()
             self._board.push(mv[0], (mv[1], mv[2]))
             return mv
         else:
@@ -101,7 +110,20 @@ class PlayerComputer:
         """ push a move for the gui, same as regular push """
         return self.push()
 
-    def _choose_move(self) -> list:
+    def choose_move(self) -> np.ndarray:
+        """ choose a move as (row, lower, upper), see _pick_index """
+        return self._board.decode(self._choose_index())
+
+    def _choose_index(self) -> int:
+        """ choose a move as packed index into the action space, timed if instrumented """
+        if self._stats is None:
+            return self._pick_index()
+        start = perf_counter()
+        index = self._pick_index()
+        self._stats.add_time('choose_move', perf_counter() - start, keep=True)
+        return index
+
+    def _pick_index(self) -> int:
         """
         choose move based on sum of elements in rows.
         objective is to obtain an even sum of binary elements
@@ -110,34 +132,42 @@ class PlayerComputer:
         If difficulty is easy, there is the possibility to
         throw in 'wrong' moves that generate a losing position.
         """
-        mvs = self._board.get_legal_moves()
-        good_moves, bad_moves = [], []
-        for mv in mvs:
-            _board = Board(pos=self._board._board.copy())
-            _board.push_mv(mv)
-            binary_sum = np.array([self._binsum(val, self._pad) for val
-                                   in _board._board.sum(axis=1)])
-            xor_sum = binary_sum.sum(axis=0)
-            test_statistic = np.sum(xor_sum % 2) != 0
-            if test_statistic:
-                good_moves.append(mv)
+        if self._tablebase is not None:
+            try:
+                mv = self._tablebase.best_move(self._board)
+            except KeyError:
+                pass
             else:
-                bad_moves.append(mv)
+                if self._stats is not None:
+                    self._stats.count('tablebase_hits')
+                return int(self._board.encode(*mv))
+        idx = self._board.get_legal_indices()
+        if self._stats is not None:
+            self._stats.count('candidates', len(idx))
+        good = self._score_moves(self._board.decode(idx))
+        good_idx, bad_idx = idx[good], idx[~good]
 
         if self._difficulty == 0:
-            if len(good_moves):
-                return good_moves[np.random.choice(len(good_moves))]
+            if len(good_idx):
+                return int(good_idx[self._rng.choice(len(good_idx))])
             else:
-                return bad_moves[np.random.choice(len(bad_moves))]
+                return int(bad_idx[self._rng.choice(len(bad_idx))])
         else:
-            weights = np.random.exponential(self._difficulty, size=len(bad_moves))
-            weights = np.append(np.ones_like(good_moves), weights)
-            all_moves = good_moves + bad_moves
-            return np.random.choice(all_moves, weights=weights)
-
-    @staticmethod
-    def _binsum(val: int, pad: int = 3) -> str:
-        """ binary representation """
-        binary = np.binary_repr(int(val))
-        diff = pad - len(binary)
-        return [int(c) for c in '0' * diff + binary]
+            weights = self._rng.exponential(self._difficulty, size=len(bad_idx))
+            weights = np.append(np.ones(len(good_idx)), weights)
+            all_idx = np.concatenate([good_idx, bad_idx])
+            return int(all_idx[self._rng.choice(len(all_idx), p=weights / weights.sum())])
+
+    def _score_moves(self, mvs: np.ndarray) -> np.ndarray:
+        """
+        score all candidate moves in one pass: build the row sums after
+        every move as a 2-D array and xor-reduce them. A move is good if
+        the nim-sum of the resulting row sums is non-zero.
+        """
+        straws = self._board._board != 0
+        csum = np.zeros((straws.shape[0], straws.shape[1] + 1), dtype=int)
+        np.cumsum(straws, axis=1, out=csum[:, 1:])
+        sums = np.tile(csum[:, -1], (len(mvs), 1))
+        sums[np.arange(len(mvs)), mvs[:, 0]] -= \
+            csum[mvs[:, 0], mvs[:, 2] + 1] - csum[mvs[:, 0], mvs[:, 1]]
+        return np.bitwise_xor.reduce(sums, axis=1) != 0
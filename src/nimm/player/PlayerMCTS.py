@@ -0,0 +1,187 @@
+import math
+import random
+from time import perf_counter
+import numpy as np
+from ..board import Board
+from ..board.BitBoard import _to_masks, _range_mask
+
+
+def _straws(mask: int) -> list:
+    """ columns of the straws in a row bitmask """
+    return [j for j in range(mask.bit_length()) if mask >> j & 1]
+
+
+def _moves(rows: tuple) -> list:
+    """
+    all distinct moves of a position given by its row bitmasks. Ranges
+    are only generated from straw to straw, wider ranges over empty
+    cells remove the same straws.
+    """
+    mvs = []
+    for row, mask in enumerate(rows):
+        cols = _straws(mask)
+        mvs.extend((row, cols[a], cols[b]) for a in range(len(cols))
+                   for b in range(a, len(cols)))
+    return mvs
+
+
+def _play(rows: tuple, mv: tuple) -> tuple:
+    """ row bitmasks after move <mv> """
+    row, lo, hi = mv
+    return rows[:row] + (rows[row] & ~_range_mask(lo, hi),) + rows[row + 1:]
+
+
+class _Node:
+    """ search tree node, wins are counted for the player who moved into the node """
+    __slots__ = ('rows', 'parent', 'move', 'children', 'untried', 'visits', 'wins')
+
+    def __init__(self, rows: tuple, parent=None, move: tuple = None) -> None:
+        self.rows = rows
+        self.parent = parent
+        self.move = move
+        self.children = []
+        self.untried = None
+        self.visits = 0
+        self.wins = 0.
+
+    def select(self, exploration: float):
+        """ child with the highest upper confidence bound """
+        scale = exploration * math.sqrt(math.log(self.visits))
+        return max(self.children, key=lambda c: c.wins / c.visits + scale / math.sqrt(c.visits))
+
+
+class PlayerMCTS:
+    """
+    Monte Carlo Tree Search player for the nimm game.
+    Searches until <budget> seconds have passed or, if given,
+    <playouts> random games were played. Playouts run on tuples of
+    row bitmasks and the tree is kept between own moves when the
+    opponent's reply is in it. Statistics of the last search are
+    kept in the stats dict.
+    """
+    def __init__(self, board: Board, name: str = 'Monty',
+                 start: bool = True, difficulty: int = 0,
+                 rng: np.random.Generator = None, budget: float = 1.,
+                 playouts: int = None, exploration: float = math.sqrt(2)) -> None:
+        """ init for the mcts nimm player """
+        self._name = name
+        self._turn = start
+        self._board = board
+        self._difficulty = difficulty
+        self._human = False
+        self._budget = float(budget)
+        self._playouts = None if playouts is None else int(playouts)
+        self._exploration = exploration
+        seed = None if rng is None else int(rng.integers(2**63))
+        self._random = random.Random(seed)
+        self._root = None
+        self.stats = {}
+        self._stats = None
+
+    def is_human(self) -> bool:
+        """ check if player is human or not """
+        return self._human
+
+    def instrument(self, stats=None) -> None:
+        """ time decisions and count playouts in <stats>, None stops """
+        self._stats = stats
+
+    def is_turn(self) -> bool:
+        """ check if its your turn to play """
+        return self._board.turn() == self._turn
+
+    def push(self) -> list:
+        """ push a move chosen by the choose_move function """
+        if self.is_turn():
+            mv = self.choose_move()
+            self._board.push(mv[0], (mv[1], mv[2]))
+            return mv
+        else:
+            print('Its not your turn to move!')
+            return []
+
+    def push_gui(self, mv: list = []) -> list:
+        """ push a move for the gui, same as regular push """
+        return self.push()
+
+    def choose_move(self) -> list:
+        """ run the search from the current position and return the most visited move """
+        root = self._reuse(tuple(_to_masks(self._board._board)))
+        reused = root.visits
+        start, playouts = perf_counter(), 0
+        while True:
+            self._iterate(root)
+            playouts += 1
+            if self._playouts is not None:
+                if playouts >= self._playouts:
+                    break
+            elif perf_counter() - start >= self._budget:
+                break
+        elapsed = perf_counter() - start
+        best = max(root.children, key=lambda c: c.visits)
+        self._root = best
+        self.stats = {'playouts': playouts, 'elapsed': elapsed,
+                      'playouts_per_sec': playouts / max(elapsed, 1e-9),
+                      'reused_visits': reused, 'win_rate': best.wins / best.visits}
+        if self._stats is not None:
+            self._stats.add_time('choose_move', elapsed, keep=True)
+            self._stats.count('playouts', playouts)
+            self._stats.count('candidates', len(root.children))
+        return list(best.move)
+
+    def _reuse(self, rows: tuple) -> _Node:
+        """ subtree of the last search matching the current position, or a new root """
+        if self._root is not None:
+            for child in self._root.children:
+                if child.rows == rows:
+                    child.parent = None
+                    return child
+        return _Node(rows)
+
+    def _iterate(self, root: _Node) -> None:
+        """ one selection, expansion, playout and backpropagation step """
+        node = root
+        while True:
+            # moves are generated once a node is selected, not when it is created
+            if node.untried is None:
+                node.untried = _moves(node.rows)
+            if node.untried or not node.children:
+                break
+            node = node.select(self._exploration)
+        if node.untried:
+            i = self._random.randrange(len(node.untried))
+            node.untried[i], node.untried[-1] = node.untried[-1], node.untried[i]
+            mv = node.untried.pop()
+            child = _Node(_play(node.rows, mv), node, mv)
+            node.children.append(child)
+            node = child
+        # the player who moved into <node> lost if the playout ends on their move
+        mover_lost = self._playout(node.rows)
+        while node is not None:
+            node.visits += 1
+            node.wins += 0. if mover_lost else 1.
+            mover_lost = not mover_lost
+            node = node.parent
+
+    def _playout(self, rows: tuple) -> bool:
+        """
+        play random moves until the board is empty, every move clears the
+        range between two random straws of a random row. True if the player
+        who made the last move before <rows> took the last straw.
+        """
+        rows = [mask for mask in rows if mask]
+        if not rows:
+            return True
+        rnd = self._random
+        mover_last = False
+        while rows:
+            i = rnd.randrange(len(rows))
+            cols = _straws(rows[i])
+            a, b = sorted((rnd.randrange(len(cols)), rnd.randrange(len(cols))))
+            rows[i] &= ~_range_mask(cols[a], cols[b])
+            if not rows[i]:
+                rows[i] = rows[-1]
+                rows.pop()
+            mover_last = not mover_last
+        # mover_last is True if the player to move at <rows> took the last straw
+        return not mover_last
@@ -0,0 +1,86 @@
+from time import perf_counter
+import numpy as np
+from ..board import Board
+from ..solver.Tablebase import _canonical, _count, _rank
+
+
+class PlayerPolicy:
+    """
+    Lookup-table player for the nimm game, playing the policy file
+    exported by nimm.train.Trainer, or the array loaded from it.
+    The file is memory mapped and every move is a single lookup of
+    the sorted row totals, the policy says how many straws to take
+    from which of them and they are taken from the left of that row.
+    With a <difficulty> above zero a random legal move is played
+    with probability difficulty / 10.
+    """
+    def __init__(self, board: Board, name: str = 'Polly',
+                 start: bool = True, difficulty: int = 0,
+                 rng: np.random.Generator = None, policy=None) -> None:
+        """ init for the policy nimm player """
+        self._name = name
+        self._turn = start
+        self._board = board
+        self._difficulty = difficulty
+        self._human = False
+        self._rng = np.random if rng is None else rng
+        self._policy = np.load(policy, mmap_mode='r') if isinstance(policy, str) else policy
+        label = policy if isinstance(policy, str) else 'array'
+        self._size = 1
+        while _count(self._size) < len(self._policy):
+            self._size += 1
+        if _count(self._size) != len(self._policy):
+            raise ValueError(f'Policy {label} is not a nimm policy')
+        try:
+            _canonical(np.count_nonzero(board._board, axis=1), self._size)
+        except KeyError:
+            raise ValueError(f'Policy {label} for size {self._size} does not cover '
+                             f'boards with {board._board.shape[0]} rows') from None
+        self._stats = None
+
+    def is_human(self) -> bool:
+        """ check if player is human or not """
+        return self._human
+
+    def instrument(self, stats=None) -> None:
+        """ time decisions in <stats>, None stops """
+        self._stats = stats
+
+    def is_turn(self) -> bool:
+        """ check if its your turn to play """
+        return self._board.turn() == self._turn
+
+    def push(self) -> list:
+        """ push a move chosen by the choose_move function """
+        if self.is_turn():
+            mv = self.choose_move()
+            self._board.push(mv[0], (mv[1], mv[2]))
+            return mv
+        else:
+            print('Its not your turn to move!')
+            return []
+
+    def push_gui(self, mv: list = []) -> list:
+        """ push a move for the gui, same as regular push """
+        return self.push()
+
+    def choose_move(self) -> list:
+        """ choose a move as [row, lower, upper], timed if instrumented """
+        if self._stats is None:
+            return self._lookup()
+        start = perf_counter()
+        mv = self._lookup()
+        self._stats.add_time('choose_move', perf_counter() - start, keep=True)
+        return mv
+
+    def _lookup(self) -> list:
+        """ look up the sorted row totals and take the straws of the policy move from the left """
+        straws = self._board._board != 0
+        if self._difficulty and self._rng.random() < self._difficulty / 10:
+            mvs = self._board.get_legal_moves()
+            return mvs[self._rng.choice(len(mvs))].tolist()
+        heaps, rows = _canonical(straws.sum(axis=1), self._size)
+        slot, take = self._policy[int(_rank(heaps))].tolist()
+        row = int(rows[slot])
+        cols = np.flatnonzero(straws[row])
+        return [row, int(cols[0]), int(cols[take - 1])]
@@ -0,0 +1,212 @@
+from time import perf_counter
+import numpy as np
+from ..board import Board
+
+_WIN = 1000
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+# depth stored for proven wins and losses, valid at any search depth
+_SOLVED = 1 << 30
+
+
+class _Timeout(Exception):
+    """ raised inside the search when the time budget is used up """
+
+
+class _TranspositionTable:
+    """
+    Transposition table with a fixed number of slots, indexed by the
+    low bits of the Zobrist hash. A slot is replaced by a search of at
+    least the same depth, or if it was written by an older search.
+    """
+    def __init__(self, bits: int = 16) -> None:
+        self._mask = (1 << bits) - 1
+        self._slots = [None] * (1 << bits)
+        self._age = 0
+        self.probes = 0
+        self.hits = 0
+
+    def new_search(self) -> None:
+        """ mark all stored entries as old, they may be replaced by any new one """
+        self._age += 1
+        self.probes = self.hits = 0
+
+    def probe(self, key: int) -> tuple:
+        """ (depth, value, flag, move) stored for <key>, or None """
+        self.probes += 1
+        slot = self._slots[key & self._mask]
+        if slot is not None and slot[0] == key:
+            self.hits += 1
+            return slot[2:]
+        return None
+
+    def store(self, key: int, depth: int, value: int, flag: int, move: tuple) -> None:
+        """ store a search result, following the replacement policy """
+        slot = self._slots[key & self._mask]
+        if slot is None or slot[1] != self._age or depth >= slot[2]:
+            self._slots[key & self._mask] = (key, self._age, depth, value, flag, move)
+
+
+class PlayerSearch:
+    """
+    Negamax player for the nimm game with alpha-beta pruning and
+    iterative deepening. Positions are hashed with incrementally
+    updated Zobrist keys into a bounded transposition table, which
+    also orders the moves by the results of the previous iteration.
+    The search stops at depth 10 - <difficulty> or after <budget>
+    seconds, whichever comes first. Statistics of the last search
+    are kept in the stats dict.
+    """
+    def __init__(self, board: Board, name: str = 'Deep',
+                 start: bool = True, difficulty: int = 0,
+                 rng: np.random.Generator = None, budget: float = 1.,
+                 depth: int = None, tt_bits: int = 16) -> None:
+        """ init for the search nimm player """
+        self._name = name
+        self._turn = start
+        self._board = board
+        self._difficulty = int(difficulty)
+        self._human = False
+        self._budget = float(budget)
+        self._depth = max(1, 10 - self._difficulty) if depth is None else int(depth)
+        rng = np.random.default_rng(0) if rng is None else rng
+        self._zobrist = rng.integers(1, 2**63, size=board._board.shape, dtype=np.int64)
+        self._tt = _TranspositionTable(int(tt_bits))
+        self.stats = {}
+        self._stats = None
+
+    def is_human(self) -> bool:
+        """ check if player is human or not """
+        return self._human
+
+    def instrument(self, stats=None) -> None:
+        """ time decisions and count searched nodes in <stats>, None stops """
+        self._stats = stats
+
+    def is_turn(self) -> bool:
+        """ check if its your turn to play """
+        return self._board.turn() == self._turn
+
+    def push(self) -> list:
+        """ push a move chosen by the choose_move function """
+        if self.is_turn():
+            mv = self.choose_move()
+            self._board.push(mv[0], (mv[1], mv[2]))
+            return mv
+        else:
+            print('Its not your turn to move!')
+            return []
+
+    def push_gui(self, mv: list = []) -> list:
+        """ push a move for the gui, same as regular push """
+        return self.push()
+
+    def choose_move(self) -> list:
+        """ iteratively deepen until the depth or time budget is reached """
+        self._search = Board(pos=self._board._board)
+        self._hash = int(np.bitwise_xor.reduce(self._zobrist[self._search._board != 0]))
+        self._tt.new_search()
+        self._nodes = 0
+        self._deadline = perf_counter() + self._budget
+        start = perf_counter()
+
+        best, value, reached = None, 0, 0
+        for depth in range(1, self._depth + 1):
+            self._root_move = best
+            try:
+                value = self._negamax(depth, -_WIN - 1, _WIN + 1, 0)
+            except _Timeout:
+                break
+            best, reached = self._root_move, depth
+            if abs(value) == _WIN:
+                break
+        if best is None:
+            best = self._moves(None)[0]
+
+        elapsed = perf_counter() - start
+        probes = max(self._tt.probes, 1)
+        self.stats = {'depth': reached, 'value': value, 'nodes': self._nodes,
+                      'elapsed': elapsed, 'nodes_per_sec': self._nodes / max(elapsed, 1e-9),
+                      'tt_probes': self._tt.probes, 'tt_hit_rate': self._tt.hits / probes}
+        if self._stats is not None:
+            self._stats.add_time('choose_move', elapsed, keep=True)
+            self._stats.count('nodes', self._nodes)
+            self._stats.count('tt_probes', self._tt.probes)
+            self._stats.count('tt_hits', self._tt.hits)
+        return list(best)
+
+    def _moves(self, first: tuple) -> list:
+        """
+        legal moves of the search board as tuples, ranges from straw to
+        straw only since wider ones remove the same straws, <first> first
+        """
+        board = self._search._board
+        mvs = self._search.get_legal_moves()
+        mvs = mvs[(board[mvs[:, 0], mvs[:, 1]] != 0) & (board[mvs[:, 0], mvs[:, 2]] != 0)]
+        mvs = [tuple(mv) for mv in mvs.tolist()]
+        if first is not None and first in mvs:
+            mvs.remove(first)
+            mvs.insert(0, first)
+        return mvs
+
+    def _push(self, mv: tuple) -> None:
+        """ push on the search board and update the hash with the removed straws """
+        row, lo, hi = mv
+        removed = self._search._board[row, lo:hi + 1] != 0
+        self._hash ^= int(np.bitwise_xor.reduce(self._zobrist[row, lo:hi + 1][removed]))
+        self._search.push(row, (lo, hi))
+
+    def _pop(self) -> None:
+        """ take back the last move on the search board and restore the hash """
+        row, (lo, hi) = self._search.pop()
+        removed = self._search._board[row, lo:hi + 1] != 0
+        self._hash ^= int(np.bitwise_xor.reduce(self._zobrist[row, lo:hi + 1][removed]))
+
+    def _negamax(self, depth: int, alpha: int, beta: int, ply: int) -> int:
+        """
+        value of the search board for the player to move: _WIN or -_WIN
+        if proven, 0 if undecided within <depth>. At the root (ply 0) the
+        best move is kept in _root_move, which the previous iteration set.
+        """
+        self._nodes += 1
+        if not self._nodes & 1023 and perf_counter() > self._deadline:
+            raise _Timeout
+        if self._search.is_gameover():
+            # the opponent took the last straw
+            return _WIN
+
+        entry = self._tt.probe(self._hash)
+        first = None
+        if entry is not None:
+            tt_depth, value, flag, first = entry
+            # the root always searches, it has to report a move
+            if tt_depth >= depth and ply > 0:
+                if flag == _EXACT:
+                    return value
+                if flag == _LOWER:
+                    alpha = max(alpha, value)
+                elif flag == _UPPER:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+        if depth == 0:
+            return 0
+        if ply == 0:
+            first = self._root_move or first
+
+        alpha0, best, best_move = alpha, -_WIN - 1, None
+        for mv in self._moves(first):
+            self._push(mv)
+            value = -self._negamax(depth - 1, -beta, -alpha, ply + 1)
+            self._pop()
+            if value > best:
+                best, best_move = value, mv
+                if ply == 0:
+                    self._root_move = mv
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+
+        flag = _UPPER if best <= alpha0 else _LOWER if best >= beta else _EXACT
+        proven = abs(best) == _WIN and (flag == _EXACT or (flag == _LOWER) == (best > 0))
+        self._tt.store(self._hash, _SOLVED if proven else depth, best, flag, best_move)
+        return best
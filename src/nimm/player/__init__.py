@@ -1 +1,4 @@
 from .Player import PlayerComputer, PlayerHuman, Player
+from .PlayerMCTS import PlayerMCTS
+from .PlayerSearch import PlayerSearch
+from .PlayerPolicy import PlayerPolicy
@@ -0,0 +1,95 @@
+"""
+Load generator for the nimm server.
+
+Opens many connections that each play games against the server's
+computer player with random legal moves, and reports the moves per
+second and the latency percentiles of the requests ::
+
+  python -m nimm.server load --clients 200 --games 5 --opponent computer:0
+
+Without --port a server is started in the same process.
+"""
+import asyncio
+import json
+from time import perf_counter
+import numpy as np
+
+from ..board import Board
+from .Server import NimmServer
+
+
+class Client:
+    """ line-delimited JSON connection to a nimm server """
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = 8765) -> 'Client':
+        return cls(*await asyncio.open_connection(host, port))
+
+    async def request(self, **request) -> dict:
+        """ send one request and wait for its response """
+        self._writer.write(json.dumps(request).encode() + b'\n')
+        await self._writer.drain()
+        return json.loads(await self._reader.readline())
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def _play(host: str, port: int, games: int, size: int, opponent: str,
+                rng: np.random.Generator, latencies: list) -> int:
+    """ one client playing <games> games with random moves, returns the number of moves sent """
+    client = await Client.connect(host, port)
+    moves = 0
+    try:
+        for game in range(games):
+            start = perf_counter()
+            state = await client.request(op='new', size=size, opponent=opponent,
+                                         first=game % 2 == 0)
+            latencies.append(perf_counter() - start)
+            board = Board(pos=np.array(state['board'], dtype=float))
+            while not state['over']:
+                mvs = board.get_legal_moves()
+                mv = mvs[rng.integers(len(mvs))]
+                start = perf_counter()
+                state = await client.request(op='move', game=state['game'],
+                                             move=[int(x) for x in mv])
+                latencies.append(perf_counter() - start)
+                if not state['ok']:
+                    raise RuntimeError(state['error'])
+                moves += 1
+                board = Board(pos=np.array(state['board'], dtype=float))
+            await client.request(op='close', game=state['game'])
+    finally:
+        await client.close()
+    return moves
+
+
+async def load(host: str = '127.0.0.1', port: int = None, clients: int = 100,
+               games: int = 5, size: int = 4, opponent: str = 'computer:0',
+               seed: int = 0) -> dict:
+    """
+    run <clients> concurrent clients against the server at <host>:<port>,
+    or against a server started here if <port> is None. Returns the
+    number of moves, moves per second and latency percentiles in seconds.
+    """
+    server = None
+    if port is None:
+        server = NimmServer()
+        port = await server.start(host, 0)
+    rngs = [np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(clients)]
+    latencies = []
+    start = perf_counter()
+    try:
+        moves = await asyncio.gather(*(_play(host, port, games, size, opponent, rng, latencies)
+                                       for rng in rngs))
+    finally:
+        if server is not None:
+            await server.stop()
+    elapsed = perf_counter() - start
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return {'moves': sum(moves), 'requests': len(latencies), 'elapsed': elapsed,
+            'moves_per_sec': sum(moves) / elapsed, 'p50': float(p50), 'p99': float(p99)}
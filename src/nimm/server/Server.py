@@ -0,0 +1,230 @@
+"""
+Asyncio server hosting many nimm games in one process.
+
+Clients talk line-delimited JSON over TCP, one request per line and
+one response line per request, in order. Start a server with ::
+
+  python -m nimm.server serve --port 8765
+
+Requests are objects with an ``op`` and its arguments:
+
+- ``{"op": "new", "size": 4, "opponent": "computer:0", "first": true}``
+  starts a game against a computer player given as tournament spec
+  (see nimm.tournament), or between two clients without ``opponent``.
+  The connection takes seat 1 if ``first``, else seat 2 and the
+  computer opens.
+- ``{"op": "join", "game": 1}`` takes the free seat of a game between
+  two clients.
+- ``{"op": "move", "game": 1, "move": [row, lo, hi]}`` plays a move for
+  the seat of the connection, the computer reply is part of the response.
+- ``{"op": "state", "game": 1}`` and ``{"op": "close", "game": 1}``, which
+  gives up the seat. A game ends when no connection holds a seat anymore,
+  also when its players disconnect.
+
+Responses carry ``"ok": true`` and the state of the game (board, whose
+turn, the seat of the connection, winner and the computer reply, if
+any), or ``"ok": false`` and an ``error``. Computer players search
+in a thread pool so that the event loop keeps serving the other
+games meanwhile.
+"""
+import asyncio
+import itertools
+import json
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from ..board import Board
+from ..tournament import make_player
+
+
+class Session:
+    """
+    one game on the server: the board, the computer opponent if any, the
+    seats (1 or 2) held by client connections and its state
+    """
+    def __init__(self, game: int, size: int, opponent: str = None, first: bool = True,
+                 rng: np.random.Generator = None) -> None:
+        self.game = game
+        self.board = Board(size=size)
+        self.opponent = None if opponent is None else \
+            make_player(opponent, self.board, not first, rng)
+        self.computer_seat = None if opponent is None else (2 if first else 1)
+        self.seats = set()
+        self.busy = False
+
+    def free_seat(self) -> int:
+        """ a seat neither a client nor the computer holds, None if there is none """
+        for seat in (1, 2):
+            if seat not in self.seats and seat != self.computer_seat:
+                return seat
+        return None
+
+    def seat_to_move(self) -> int:
+        """ seat of the player to move """
+        return 1 if self.board.turn() else 2
+
+    def state(self, reply: list = None, seat: int = None) -> dict:
+        """ response body describing the game, as seen from <seat> """
+        over = bool(self.board.is_gameover())
+        return {'ok': True, 'game': self.game,
+                'board': (self.board._board != 0).astype(int).tolist(),
+                'turn': self.seat_to_move(), 'seat': seat, 'over': over,
+                'winner': self.board.winner() if over else None, 'reply': reply}
+
+    def computer_to_move(self) -> bool:
+        """ check if the computer opponent has to move """
+        return self.opponent is not None and not self.board.is_gameover() \
+            and self.opponent.is_turn()
+
+
+class NimmServer:
+    """
+    Asyncio server holding independent game sessions, see the module
+    docstring for the protocol. Every connection keeps the seats it
+    holds, a session is dropped when its last seat is given up.
+    """
+    def __init__(self, workers: int = None, seed: int = None) -> None:
+        self.sessions = {}
+        self._ids = itertools.count(1)
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._rng = np.random.default_rng(seed)
+        self._server = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765) -> int:
+        """ start listening, returns the port (useful with port 0) """
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self) -> None:
+        """ stop listening and shut the thread pool down """
+        self._server.close()
+        await self._server.wait_closed()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """ serve one connection, one response line per request line """
+        seats = {}
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    response = await self._dispatch(request, seats)
+                except (ValueError, KeyError, TypeError, IndexError) as err:
+                    response = {'ok': False, 'error': f'{type(err).__name__}: {err}'}
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for game, seat in seats.items():
+                self._leave(game, seat)
+            writer.close()
+
+    def _leave(self, game: int, seat: int) -> None:
+        """ give up a seat, the session is dropped once no client holds one """
+        session = self.sessions.get(game)
+        if session is not None:
+            session.seats.discard(seat)
+            if not session.seats:
+                del self.sessions[game]
+
+    async def _dispatch(self, request: dict, seats: dict) -> dict:
+        """ run one request of the connection holding <seats> (game -> seat), return its response """
+        op = request['op']
+        if op == 'new':
+            first = bool(request.get('first', True))
+            session = Session(next(self._ids), int(request.get('size', 4)),
+                              request.get('opponent'), first, self._rng)
+            seat = 1 if first else 2
+            self.sessions[session.game] = session
+            session.seats.add(seat)
+            seats[session.game] = seat
+            return session.state(await self._reply(session), seat)
+        session = self.sessions[int(request['game'])]
+        seat = seats.get(session.game)
+        if op == 'state':
+            return session.state(seat=seat)
+        if op == 'join':
+            if seat is not None:
+                raise ValueError('you already play in this game')
+            seat = session.free_seat()
+            if seat is None:
+                raise ValueError('the game has no free seat')
+            session.seats.add(seat)
+            seats[session.game] = seat
+            return session.state(seat=seat)
+        if op not in ('close', 'move'):
+            raise ValueError(f'unknown op {op!r}')
+        if seat is None:
+            raise ValueError('you do not play in this game')
+        if op == 'close':
+            del seats[session.game]
+            self._leave(session.game, seat)
+            return {'ok': True, 'game': session.game}
+        if session.board.is_gameover():
+            raise ValueError('the game is over')
+        if session.busy or session.seat_to_move() != seat:
+            raise ValueError('it is not your turn to move')
+        row, lo, hi = (int(x) for x in request['move'])
+        session.board.push(row, (lo, hi))
+        return session.state(await self._reply(session), seat)
+
+    async def _reply(self, session: Session) -> list:
+        """ let the computer move in the thread pool if it is its turn, returns its move """
+        if not session.computer_to_move():
+            return None
+        session.busy = True
+        try:
+            mv = await asyncio.get_running_loop().run_in_executor(
+                self._executor, session.opponent.choose_move)
+        finally:
+            session.busy = False
+        mv = [int(x) for x in mv]
+        session.board.push_mv(mv)
+        return mv
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8765, workers: int = None) -> None:
+    """ run a server until cancelled """
+    server = NimmServer(workers)
+    port = await server.start(host, port)
+    print(f'nimm server listening on {host}:{port}')
+    await server.serve_forever()
+
+
+def main() -> None:
+    import argparse  # only needed on the command line, keeps import nimm light
+    parser = argparse.ArgumentParser(description='nimm game server and load generator')
+    commands = parser.add_subparsers(dest='command', required=True)
+    srv = commands.add_parser('serve', help='run the server')
+    srv.add_argument('--host', default='127.0.0.1')
+    srv.add_argument('--port', type=int, default=8765)
+    srv.add_argument('--workers', type=int, default=None, help='threads for computer moves')
+    gen = commands.add_parser('load', help='load test a server on localhost')
+    gen.add_argument('--host', default='127.0.0.1')
+    gen.add_argument('--port', type=int, default=None,
+                     help='server port, by default a server is started in this process')
+    gen.add_argument('--clients', type=int, default=100)
+    gen.add_argument('--games', type=int, default=5, help='games per client')
+    gen.add_argument('--size', type=int, default=4)
+    gen.add_argument('--opponent', default='computer:0')
+    gen.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        try:
+            asyncio.run(serve(args.host, args.port, args.workers))
+        except KeyboardInterrupt:
+            pass
+        return None
+    from .Client import load
+    stats = asyncio.run(load(args.host, args.port, args.clients, args.games, args.size,
+                             args.opponent, args.seed))
+    print(f'{stats["moves"]} moves, {stats["requests"]} requests in {stats["elapsed"]:.2f} s: '
+          f'{stats["moves_per_sec"]:.0f} moves/s, '
+          f'latency p50 {stats["p50"] * 1e3:.2f} ms  p99 {stats["p99"] * 1e3:.2f} ms')
+    return None
@@ -0,0 +1,2 @@
+from .Server import NimmServer, Session, serve
+from .Client import Client, load
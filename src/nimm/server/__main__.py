@@ -0,0 +1,3 @@
+from .Server import main
+
+main()
@@ -0,0 +1,63 @@
+from functools import reduce
+from operator import xor
+import numpy as np
+
+
+def grundy(runs: tuple) -> int:
+    """
+    Sprague-Grundy value of a single row given by its runs.
+    A move may reach over empty cells, so the runs of a row are not
+    independent games. Clearing from the first straw onwards reaches
+    every smaller count of straws and no move keeps the count, so by
+    induction the row is worth a nim heap of its number of straws.
+    """
+    return sum(runs)
+
+
+def _misere(heaps: list) -> bool:
+    """
+    misere nim: True if the player to move wins. With only heaps of
+    size one the parity decides, otherwise the nim-sum as in normal play.
+    """
+    if all(heap <= 1 for heap in heaps):
+        return sum(heaps) % 2 == 0
+    return reduce(xor, heaps, 0) != 0
+
+
+def is_winning(board) -> bool:
+    """
+    check if the player to move wins the position with perfect play.
+    A finished game is won by the player to move, the opponent took
+    the last straw. Only the number of straws per row counts, see grundy.
+    """
+    if hasattr(board, 'row_totals'):
+        return _misere(board.row_totals())
+    return _misere(np.count_nonzero(board._board, axis=1).tolist())
+
+
+def best_moves(board) -> np.ndarray:
+    """
+    all legal moves leaving the opponent in a lost position, as rows
+    of (row, lower, upper) in the order of Board.get_legal_moves.
+    If the position is lost every move loses and all legal moves are
+    returned, check with is_winning to tell both cases apart.
+    """
+    straws = board._board != 0
+    heaps = straws.sum(axis=1).tolist()
+    nimsum = reduce(xor, heaps, 0)
+    actions = board.action_space()
+    per_row = len(actions) // len(heaps)
+    csum = np.zeros((straws.shape[0], straws.shape[1] + 1), dtype=int)
+    np.cumsum(straws, axis=1, out=csum[:, 1:])
+
+    found = []
+    for row, old in enumerate(heaps):
+        # a lost position for the opponent has nim-sum zero, or only
+        # heaps of size one, so these are the only heaps worth moving to
+        targets = [new for new in {old ^ nimsum, 0, 1}
+                   if new < old and not _misere(heaps[:row] + [new] + heaps[row + 1:])]
+        if targets:
+            block = actions[row * per_row:(row + 1) * per_row]
+            new = old - (csum[row, block[:, 2] + 1] - csum[row, block[:, 1]])
+            found.append(block[np.isin(new, targets)])
+    return np.concatenate(found) if found else board.get_legal_moves()
@@ -0,0 +1,199 @@
+"""
+Endgame tablebase for the nimm game.
+
+Generate a tablebase for all positions up to board size 5 with ::
+
+  python -m nimm.solver 5 nimm5.ntb
+
+Only the number of straws in every row decides a position (see
+Solver.grundy), and not which row holds which count. A position is
+reduced to its sorted row totals, the canonical key as nim heaps, and
+indexed by the rank of that sorted vector. The file holds a small
+header followed by one record per position with the outcome and one
+best move, stored as the slot of the sorted totals and the number of
+straws to take from the left of that row.
+"""
+from functools import lru_cache
+import numpy as np
+
+_MAGIC = b'NIMMTB02'
+_HEADER = np.dtype([('magic', 'S8'), ('size', '<u4'), ('reserved', '<u4'), ('count', '<u8')])
+_RECORD = np.dtype([('outcome', 'i1'), ('row', 'u1'), ('take', 'u1')])
+_NO_MOVE = 255
+
+
+@lru_cache(maxsize=None)
+def _rank_table(size: int) -> np.ndarray:
+    """
+    prefix table ranking the sorted row totals t_0 <= ... <= t_n-1 of
+    boards of size <size>, where t_k <= 2k + 1. table[k, v] sums the
+    number of ways to fill the slots after k over all t_k < v, so the
+    rank is the sum over k of table[k, t_k] - table[k, t_k-1].
+    """
+    table = np.zeros((size, 2 * size + 1), dtype=np.int64)
+    # completions of the slots after k given t_k = u, for the last slot just one
+    after = [1] * (2 * size)
+    for k in reversed(range(size)):
+        prefix = [0]
+        for u in range(2 * k + 2):
+            prefix.append(prefix[-1] + after[u])
+        table[k, :len(prefix)] = prefix
+        table[k, len(prefix):] = prefix[-1]
+        after = [prefix[-1] - prefix[u] for u in range(2 * k + 1)]
+    table.setflags(write=False)
+    return table
+
+
+def _count(size: int) -> int:
+    """ number of sorted row totals of boards of size <size> """
+    return int(_rank_table(size)[0, 2])
+
+
+def _rank(heaps: np.ndarray) -> np.ndarray:
+    """ index of sorted row totals, of shape (rows,) or (positions, rows) """
+    heaps = np.asarray(heaps, dtype=np.int64)
+    table = _rank_table(heaps.shape[-1])
+    prev = np.zeros_like(heaps)
+    prev[..., 1:] = heaps[..., :-1]
+    slots = np.arange(heaps.shape[-1])
+    return (table[slots, heaps] - table[slots, prev]).sum(axis=-1)
+
+
+def _unrank(index: np.ndarray, size: int) -> np.ndarray:
+    """ sorted row totals of an array of indices, shape (positions, size), see _rank """
+    table = _rank_table(size)
+    rest = np.array(index, dtype=np.int64)
+    heaps = np.zeros((len(rest), size), dtype=np.int64)
+    prev = np.zeros(len(rest), dtype=np.int64)
+    for k in range(size):
+        target = rest + table[k, prev]
+        prev = np.searchsorted(table[k], target, side='right') - 1
+        rest = target - table[k, prev]
+        heaps[:, k] = prev
+    return heaps
+
+
+def _canonical(totals: np.ndarray, size: int) -> tuple:
+    """
+    sorted row totals of a board padded or cut to <size> slots, and the
+    board row of every slot (-1 for padding). KeyError if not covered.
+    """
+    order = np.argsort(totals, kind='stable')
+    heaps = totals[order]
+    if len(heaps) >= size:
+        if heaps[:len(heaps) - size].any():
+            raise KeyError('board is larger than the tablebase')
+        heaps, rows = heaps[len(heaps) - size:], order[len(heaps) - size:]
+    else:
+        pad = size - len(heaps)
+        heaps = np.concatenate([np.zeros(pad, dtype=heaps.dtype), heaps])
+        rows = np.concatenate([np.full(pad, -1), order])
+    if (heaps > 2 * np.arange(size) + 1).any():
+        raise KeyError('board is larger than the tablebase')
+    return heaps, rows
+
+
+def _solve(heaps: np.ndarray) -> tuple:
+    """
+    outcome and one best move for a batch of positions given by their
+    row heaps, shape (positions, rows). Moves remove straws from the
+    left of the row, which is always legal. Lost positions take one
+    straw from the first non-empty row.
+    """
+    nimsum = np.bitwise_xor.reduce(heaps, axis=1)
+    big = np.sum(heaps > 1, axis=1)
+    ones = np.sum(heaps == 1, axis=1)
+    outcome = np.where(big == 0, ones % 2 == 0, nimsum != 0)
+
+    row = np.full(len(heaps), _NO_MOVE)
+    take = np.zeros(len(heaps), dtype=int)
+    for rw in range(heaps.shape[1]):
+        old = heaps[:, rw]
+        for new in (old ^ nimsum, np.zeros_like(old), np.ones_like(old)):
+            _big = big - (old > 1) + (new > 1)
+            _ones = ones - (old == 1) + (new == 1)
+            lost = np.where(_big == 0, _ones % 2 == 1, (nimsum ^ old ^ new) == 0)
+            found = outcome & (row == _NO_MOVE) & (new < old) & lost
+            row[found], take[found] = rw, (old - new)[found]
+
+    empty = heaps == 0
+    fallback = (row == _NO_MOVE) & ~empty.all(axis=1)
+    row[fallback], take[fallback] = np.argmin(empty, axis=1)[fallback], 1
+    return outcome, row, take
+
+
+def generate(size: int, path: str, chunk: int = 1 << 20) -> int:
+    """
+    solve all canonical positions of boards up to size <size> and
+    write the tablebase to <path>. Returns the number of positions.
+    """
+    count = _count(size)
+    header = np.zeros(1, dtype=_HEADER)
+    header['magic'], header['size'], header['count'] = _MAGIC, size, count
+    with open(path, 'wb') as fh:
+        header.tofile(fh)
+    records = np.memmap(path, dtype=_RECORD, mode='r+', offset=_HEADER.itemsize,
+                        shape=(count,))
+    for start in range(0, count, chunk):
+        heaps = _unrank(np.arange(start, min(start + chunk, count)), size)
+        outcome, row, take = _solve(heaps)
+        block = records[start:start + len(heaps)]
+        block['outcome'], block['row'], block['take'] = outcome, row, take
+    records.flush()
+    del records
+    return count
+
+
+class Tablebase:
+    """
+    Read-only tablebase, memory mapped so that many processes
+    share one page-cached copy of the file.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        header = np.fromfile(path, dtype=_HEADER, count=1)
+        if not len(header) or header['magic'][0] != _MAGIC:
+            raise ValueError(f'{path} is not a nimm tablebase')
+        self.size = int(header['size'][0])
+        self._records = np.memmap(path, dtype=_RECORD, mode='r', offset=_HEADER.itemsize,
+                                  shape=(int(header['count'][0]),))
+
+    def __reduce__(self) -> tuple:
+        """ pickle by path, workers map the file themselves """
+        return (Tablebase, (self.path,))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def lookup(self, board) -> tuple:
+        """
+        outcome and best move of a board, as (winning, [row, lo, hi]).
+        The move is None if the game is over.
+        Raises KeyError if the position is not in the tablebase.
+        """
+        straws = board._board != 0
+        heaps, rows = _canonical(straws.sum(axis=1), self.size)
+        record = self._records[int(_rank(heaps))]
+        if record['row'] == _NO_MOVE:
+            return bool(record['outcome']), None
+        row = int(rows[record['row']])
+        cols = np.flatnonzero(straws[row])
+        return bool(record['outcome']), [row, int(cols[0]), int(cols[record['take'] - 1])]
+
+    def is_winning(self, board) -> bool:
+        """ check if the player to move wins the position """
+        return self.lookup(board)[0]
+
+    def best_move(self, board) -> list:
+        """ one best move in the position as [row, lo, hi] """
+        return self.lookup(board)[1]
+
+
+def main() -> None:
+    import argparse  # only needed on the command line, keeps import nimm light
+    parser = argparse.ArgumentParser(description='generate a nimm endgame tablebase')
+    parser.add_argument('size', type=int, help='largest board size covered')
+    parser.add_argument('path', help='output file')
+    args = parser.parse_args()
+    count = generate(args.size, args.path)
+    print(f'Wrote {count} positions to {args.path}')
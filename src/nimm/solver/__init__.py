@@ -0,0 +1,2 @@
+from .Solver import best_moves, is_winning, grundy
+from .Tablebase import Tablebase, generate
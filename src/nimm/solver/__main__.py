@@ -0,0 +1,3 @@
+from .Tablebase import main
+
+main()
@@ -0,0 +1,125 @@
+from collections import defaultdict
+import numpy as np
+
+
+class Stats:
+    """
+    Counters and timers for the hot paths of boards and players.
+    Instrumented objects hold a Stats or None and only record while
+    it is set, so disabled instrumentation costs one None check.
+    Every object gets its own child, see child.
+    """
+    def __init__(self, name: str = 'stats') -> None:
+        self.name = name
+        self.counts = defaultdict(int)
+        self.times = defaultdict(float)
+        self.samples = defaultdict(list)
+        self.children = {}
+
+    def count(self, key: str, n: int = 1) -> None:
+        """ add <n> to the counter <key> """
+        self.counts[key] += n
+
+    def add_time(self, key: str, seconds: float, keep: bool = False) -> None:
+        """
+        add <seconds> to the timer <key> and count one call. With <keep>
+        the time is also kept as a sample, for latency percentiles.
+        """
+        self.times[key] += seconds
+        self.counts[key] += 1
+        if keep:
+            self.samples[key].append(seconds)
+
+    def record(self, key: str, value: float) -> None:
+        """ keep a sample of <key>, e.g. the latency of one decision """
+        self.samples[key].append(value)
+
+    def child(self, name: str) -> 'Stats':
+        """ sub-stats <name>, created on first use """
+        if name not in self.children:
+            self.children[name] = Stats(name)
+        return self.children[name]
+
+    def summary(self) -> dict:
+        """
+        plain dict of all counters, timers (total and mean per call in seconds),
+        sample percentiles and the summaries of the children
+        """
+        out = {'counts': dict(self.counts),
+               'times': {key: {'total': total, 'mean': total / max(self.counts[key], 1)}
+                         for key, total in self.times.items()}}
+        out['samples'] = {}
+        for key, values in self.samples.items():
+            p50, p99 = np.percentile(values, [50, 99])
+            out['samples'][key] = {'n': len(values), 'mean': float(np.mean(values)),
+                                   'p50': float(p50), 'p99': float(p99),
+                                   'max': float(np.max(values))}
+        out.update({name: child.summary() for name, child in self.children.items()})
+        return out
+
+    def __repr__(self) -> str:
+        """ indented report of the counters, timers and samples """
+        lines = [f'{self.name}:']
+        for key, n in sorted(self.counts.items()):
+            if key in self.times:
+                total = self.times[key]
+                lines.append(f'  {key:<20} {n:>10} calls {total * 1e3:>10.2f} ms '
+                             f'{total / n * 1e6:>10.1f} us/call')
+            else:
+                lines.append(f'  {key:<20} {n:>10}')
+        for key, values in sorted(self.samples.items()):
+            p50, p99 = np.percentile(values, [50, 99])
+            lines.append(f'  {key:<20} {len(values):>10} samples  p50 {p50 * 1e3:.2f} ms  '
+                         f'p99 {p99 * 1e3:.2f} ms')
+        for child in self.children.values():
+            lines.extend('  ' + line for line in repr(child).splitlines())
+        return '\n'.join(lines)
+
+
+class Profile:
+    """
+    cProfile and tracemalloc capture around a block of code ::
+
+      with Profile() as prof:
+          game.play()
+      prof.print_stats(10)
+
+    Both modules are imported only when profiling.
+    """
+    def __init__(self, memory: bool = True) -> None:
+        self._memory = memory
+        self.profile = None
+        self.snapshot = None
+        self.peak = None
+
+    def __enter__(self) -> 'Profile':
+        import cProfile
+        if self._memory:
+            import tracemalloc
+            tracemalloc.start()
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        import cProfile
+        import pstats
+        self._profiler.disable()
+        if self._memory:
+            import tracemalloc
+            self.peak = tracemalloc.get_traced_memory()[1]
+            self.snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+                tracemalloc.Filter(False, cProfile.__file__),
+                tracemalloc.Filter(False, tracemalloc.__file__)])
+            tracemalloc.stop()
+        self.profile = pstats.Stats(self._profiler)
+        return None
+
+    def print_stats(self, limit: int = 20, sort: str = 'cumulative') -> None:
+        """ print the <limit> top functions and, if traced, the top allocations """
+        self.profile.sort_stats(sort).print_stats(limit)
+        if self.snapshot is not None:
+            print(f'peak traced memory: {self.peak / 1024:.1f} KiB')
+            for stat in self.snapshot.statistics('lineno')[:limit]:
+                print(stat)
@@ -0,0 +1 @@
+from .Stats import Stats, Profile
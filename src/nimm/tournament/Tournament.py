@@ -0,0 +1,193 @@
+"""
+Tournaments between computer players, run across a process pool.
+
+Players are given as specs ``kind[:difficulty][:option=value ...]``,
+e.g. ``computer:0`` or ``computer:0:tablebase=nimm5.ntb``. Option values
+are read as Python literals where they parse as one, else as strings. Run a
+round robin from the command line with ::
+
+  python -m nimm.tournament computer:0 computer:3 computer:9 --games 400
+"""
+import ast
+import itertools
+import multiprocessing
+import os
+from functools import lru_cache
+from time import perf_counter
+import numpy as np
+
+from ..board import Board
+from ..game import Game
+from ..player import PlayerComputer, PlayerMCTS, PlayerSearch, PlayerPolicy
+from ..solver import Tablebase
+
+PLAYERS = {'computer': PlayerComputer, 'mcts': PlayerMCTS, 'search': PlayerSearch,
+           'policy': PlayerPolicy}
+
+
+def _value(text: str):
+    """ option value of a spec as Python literal, e.g. a number, else the string itself """
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        return text
+
+
+@lru_cache(maxsize=None)
+def _parse_spec(spec: str) -> tuple:
+    """
+    kind and options of <spec>, parsed once per process. Tablebase and
+    policy files are opened here, so all players built from the spec
+    share one mapping instead of reading the file every game.
+    """
+    kind, *opts = spec.split(':')
+    kwargs = {}
+    if opts and '=' not in opts[0]:
+        kwargs['difficulty'] = int(opts.pop(0))
+    kwargs.update((key, _value(text)) for key, text in (opt.split('=', 1) for opt in opts))
+    if 'tablebase' in kwargs:
+        kwargs['tablebase'] = Tablebase(kwargs['tablebase'])
+    if 'policy' in kwargs:
+        kwargs['policy'] = np.load(kwargs['policy'], mmap_mode='r')
+    return kind, tuple(kwargs.items())
+
+
+def make_player(spec: str, board: Board, start: bool, rng: np.random.Generator):
+    """ build the player described by <spec> on <board> """
+    kind, options = _parse_spec(spec)
+    return PLAYERS[kind](board, name=spec, start=start, rng=rng, **dict(options))
+
+
+def play_game(p1, p2, board: Board) -> bool:
+    """ play one headless game between two computer players, True if Player 1 won """
+    Game(p1, p2, board, headless=True).play()
+    return board.turn()
+
+
+def _run_chunk(task: tuple) -> tuple:
+    """
+    worker: play a chunk of games between two specs with its own
+    random stream, alternating who starts. Returns the pair and the
+    number of games won by each of them.
+    """
+    i, j, spec_i, spec_j, games, size, seed = task
+    rng = np.random.default_rng(seed)
+    wins_i = 0
+    for game in range(games):
+        board = Board(size=size)
+        i_starts = game % 2 == 0
+        p_i = make_player(spec_i, board, i_starts, rng)
+        p_j = make_player(spec_j, board, not i_starts, rng)
+        p1, p2 = (p_i, p_j) if i_starts else (p_j, p_i)
+        wins_i += play_game(p1, p2, board) == i_starts
+    return i, j, wins_i, games - wins_i
+
+
+class Results:
+    """
+    Win counts of a tournament, wins[i, j] is the number
+    of games player i won against player j.
+    """
+    def __init__(self, specs: list) -> None:
+        self.specs = list(specs)
+        self.wins = np.zeros((len(specs), len(specs)), dtype=int)
+        self.elapsed = 0.
+
+    def add(self, i: int, j: int, wins_i: int, wins_j: int) -> None:
+        """ add the outcome of a chunk of games """
+        self.wins[i, j] += wins_i
+        self.wins[j, i] += wins_j
+
+    def games(self) -> np.ndarray:
+        """ number of games played between every pair """
+        return self.wins + self.wins.T
+
+    def win_rate(self, z: float = 1.96) -> tuple:
+        """
+        win rate of every player against every other one with the
+        Wilson score interval, as arrays (rate, lower, upper).
+        Pairs without games are nan.
+        """
+        n = self.games().astype(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rate = self.wins / n
+            centre = (rate + z**2 / (2 * n)) / (1 + z**2 / n)
+            half = z * np.sqrt(rate * (1 - rate) / n + z**2 / (4 * n**2)) / (1 + z**2 / n)
+        return rate, np.clip(centre - half, 0, 1), np.clip(centre + half, 0, 1)
+
+    def table(self) -> str:
+        """ win rate table of the row player against the column player """
+        rate, lower, upper = self.win_rate()
+        width = max(22, *(len(spec) + 2 for spec in self.specs))
+        lines = [' ' * width + ''.join(f'{spec:>{width}}' for spec in self.specs)]
+        for i, spec in enumerate(self.specs):
+            cells = ['-' if np.isnan(rate[i, j]) else
+                     f'{rate[i, j]:.3f} [{lower[i, j]:.3f}, {upper[i, j]:.3f}]'
+                     for j in range(len(self.specs))]
+            lines.append(f'{spec:<{width}}' + ''.join(f'{cell:>{width}}' for cell in cells))
+        total = self.games().sum() // 2
+        lines.append(f'{total} games in {self.elapsed:.1f} s '
+                     f'({total / max(self.elapsed, 1e-9):.0f} games/s)')
+        return '\n'.join(lines)
+
+
+def run(specs: list, pairs: list, games: int, size: int = 4, processes: int = None,
+        chunk: int = 20, seed: int = 0, progress=None) -> Results:
+    """
+    play <games> games for every pair of spec indices in <pairs> on a
+    process pool. Games are handed out in chunks, every chunk with its
+    own random stream spawned from <seed>, so results do not depend on
+    the number of processes. <progress> is called with the results
+    after every finished chunk.
+    """
+    tasks = [(i, j, specs[i], specs[j], min(chunk, games - start), size)
+             for i, j in pairs for start in range(0, games, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    tasks = [task + (sq,) for task, sq in zip(tasks, seeds)]
+
+    results = Results(specs)
+    start = perf_counter()
+    with multiprocessing.Pool(processes or os.cpu_count()) as pool:
+        for outcome in pool.imap_unordered(_run_chunk, tasks):
+            results.add(*outcome)
+            results.elapsed = perf_counter() - start
+            if progress is not None:
+                progress(results)
+    return results
+
+
+def round_robin(specs: list, games: int, **kwargs) -> Results:
+    """ every spec plays <games> games against every other spec """
+    return run(specs, list(itertools.combinations(range(len(specs)), 2)), games, **kwargs)
+
+
+def gauntlet(challenger: str, specs: list, games: int, **kwargs) -> Results:
+    """ <challenger> plays <games> games against each of <specs> """
+    return run([challenger, *specs], [(0, j) for j in range(1, len(specs) + 1)],
+               games, **kwargs)
+
+
+def main() -> None:
+    import argparse  # only needed on the command line, keeps import nimm light
+    parser = argparse.ArgumentParser(description='tournament between nimm computer players')
+    parser.add_argument('specs', nargs='+', help='players as kind[:difficulty][:option=value]')
+    parser.add_argument('--games', type=int, default=100, help='games per pairing')
+    parser.add_argument('--size', type=int, default=4)
+    parser.add_argument('--gauntlet', action='store_true',
+                        help='first player against all others instead of round robin')
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--chunk', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    def progress(results: Results) -> None:
+        print(f'\r{results.games().sum() // 2} games played', end='', flush=True)
+
+    kwargs = dict(size=args.size, processes=args.processes, chunk=args.chunk,
+                  seed=args.seed, progress=progress)
+    if args.gauntlet:
+        results = gauntlet(args.specs[0], args.specs[1:], args.games, **kwargs)
+    else:
+        results = round_robin(args.specs, args.games, **kwargs)
+    print()
+    print(results.table())
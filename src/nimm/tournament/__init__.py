@@ -0,0 +1 @@
+from .Tournament import Results, round_robin, gauntlet, run, make_player, play_game, PLAYERS
@@ -0,0 +1,3 @@
+from .Tournament import main
+
+main()
@@ -0,0 +1,230 @@
+"""
+Self-play training of a lookup-table policy for the nimm game.
+
+A position is reduced to the sorted number of straws in every row,
+which decides its value (see nimm.solver.grundy), and numbered by
+the rank of that vector as in the tablebase, so boards that only
+differ by the order of their rows share one state. The trainer
+learns the value of every such state for the player to move by
+self-play: a batch of games is stepped together, every visited
+state is moved towards the best value among its moves and every
+game continues with an epsilon greedy move. Train size 6 and export the policy with ::
+
+  python -m nimm.train 6 policy6.npy --steps 20000
+
+and play with it through nimm.player.PlayerPolicy.
+"""
+from time import perf_counter
+import numpy as np
+
+from ..solver.Tablebase import _count, _rank, _rank_table, _unrank
+
+# move of the exported policy: take <take> straws from slot <row> of the sorted row totals
+POLICY = np.dtype([('row', 'u1'), ('take', 'u1')])
+
+
+def state_index(totals: np.ndarray) -> np.ndarray:
+    """ state index of row totals in any order, of shape (rows,) or (batch, rows) """
+    return _rank(np.sort(totals, axis=-1))
+
+
+def _exact(totals: np.ndarray) -> np.ndarray:
+    """ misere nim outcome of a batch of row totals, True if the player to move wins """
+    big = (totals > 1).any(axis=1)
+    nimsum = np.bitwise_xor.reduce(totals, axis=1)
+    return np.where(big, nimsum != 0, totals.sum(axis=1) % 2 == 0)
+
+
+class Trainer:
+    """
+    Tabular value learning by batched self-play over the sorted row
+    totals of boards of size <size>. values[s] estimates the chance that
+    the player to move in state s wins, the empty board is won by the
+    player to move as the opponent took the last straw. <batch> games
+    are played at once with vectorised updates, finished games restart
+    from the full board or, with probability <explore_starts>, from a
+    state drawn uniformly.
+    """
+    def __init__(self, size: int, batch: int = 1024, alpha: float = 0.2,
+                 epsilon: float = 0.1, explore_starts: float = 0.5,
+                 seed: int = None) -> None:
+        self.size = size
+        self.batch = batch
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.explore_starts = explore_starts
+        self._rng = np.random.default_rng(seed)
+        self._full = 2 * np.arange(size) + 1
+        self._table = _rank_table(size)
+        self.values = np.full(_count(size), 0.5, dtype=np.float32)
+        self.values[0] = 1.
+        self.steps = 0
+        self.games = 0
+        self.history = []
+        # every (slot, new total) a row can be cut down to, as flat candidate columns
+        self._cand_slot = np.repeat(np.arange(size), 2 * size - 1)
+        self._cand_new = np.tile(np.arange(2 * size - 1), size)
+        self._heaps = self._starts(batch)
+
+    def _starts(self, n: int) -> np.ndarray:
+        """ sorted row totals of <n> new games, full boards or states drawn uniformly """
+        heaps = np.tile(self._full, (n, 1))
+        rand = self._rng.random(n) < self.explore_starts
+        # state 0 is the empty board, every other state has a move left
+        heaps[rand] = _unrank(self._rng.integers(1, len(self.values), size=rand.sum()), self.size)
+        return heaps
+
+    def _candidates(self, heaps: np.ndarray) -> tuple:
+        """
+        state indices after every candidate move, 0 for illegal ones, and
+        their validity, both of shape (batch, candidates). Cutting slot k
+        down to v moves v to slot j, the number of totals below it, and
+        shifts slots j to k - 1 up by one. Only the rank terms of slots j
+        to k + 1 change, so the ranks of the legal moves follow from prefix
+        sums of the terms of the current totals and of the totals shifted
+        by one, without sorting.
+        """
+        table, n = self._table, self.size
+        prev = np.zeros_like(heaps)
+        prev[:, 1:] = heaps[:, :-1]
+        prev2 = np.zeros_like(heaps)
+        prev2[:, 2:] = heaps[:, :-2]
+        slots = np.arange(n)
+        terms = np.zeros((len(heaps), n + 1), dtype=np.int64)
+        np.cumsum(table[slots, heaps] - table[slots, prev], axis=1, out=terms[:, 1:])
+        shift = np.zeros((len(heaps), n + 1), dtype=np.int64)
+        np.cumsum(table[slots, prev] - table[slots, prev2], axis=1, out=shift[:, 1:])
+        below = (heaps[:, :, None] < np.arange(2 * n - 1)).sum(axis=1)
+
+        valid = self._cand_new < heaps[:, self._cand_slot]
+        game, cand = np.nonzero(valid)
+        slot, new = self._cand_slot[cand], self._cand_new[cand]
+        j = below[game, new]
+        moved = slot > j
+        rank = terms[game, j] + table[j, new] - table[j, prev[game, j]]
+        j1 = np.minimum(j + 1, n - 1)
+        rank += np.where(moved, table[j1, heaps[game, j]] - table[j1, new]
+                         + shift[game, slot + 1] - shift[game, np.minimum(j + 2, n)], 0)
+        k1 = np.minimum(slot + 1, n - 1)
+        before = np.where(moved, prev[game, slot], new)
+        rank += np.where(slot + 1 < n, table[k1, heaps[game, k1]] - table[k1, before], 0)
+        rank += terms[game, n] - terms[game, np.minimum(slot + 2, n)]
+        index = np.zeros(valid.shape, dtype=np.int64)
+        index[game, cand] = rank
+        return index, valid
+
+    def _greedy(self, heaps: np.ndarray) -> tuple:
+        """ value of every candidate move for the mover (-1 if illegal), the best one and its validity """
+        index, valid = self._candidates(heaps)
+        # the mover wins when the opponent loses the next state
+        worth = np.where(valid, 1. - self.values[index], -1.)
+        return worth, worth.argmax(axis=1), valid
+
+    def step(self) -> None:
+        """ one move in every game of the batch, with the value update of the states moved from """
+        heaps = self._heaps
+        worth, best, valid = self._greedy(heaps)
+        states = _rank(heaps)
+        target = worth[np.arange(len(heaps)), best]
+        self._delta = np.abs(target - self.values[states]).mean()
+        self.values[states] += self.alpha * (target - self.values[states])
+
+        explore = self._rng.random(len(heaps)) < self.epsilon
+        if explore.any():
+            weights = valid[explore] * self._rng.random(valid[explore].shape)
+            best[explore] = weights.argmax(axis=1)
+        heaps[np.arange(len(heaps)), self._cand_slot[best]] = self._cand_new[best]
+        heaps.sort(axis=1)
+
+        done = ~heaps.any(axis=1)
+        if done.any():
+            heaps[done] = self._starts(done.sum())
+        self.games += int(done.sum())
+        self.steps += 1
+
+    def accuracy(self, sample: int = 100000) -> float:
+        """ share of states (all, or a random <sample> of them) whose value has the exact outcome """
+        count = len(self.values)
+        index = np.arange(count) if count <= sample else self._rng.integers(count, size=sample)
+        return float(np.mean((self.values[index] > 0.5) == _exact(_unrank(index, self.size))))
+
+    def train(self, steps: int, report: int = 1000, checkpoint: str = None,
+              callback=None) -> list:
+        """
+        run <steps> steps. Every <report> steps games per second, the
+        mean value change and the accuracy are appended to history
+        and passed to <callback>, and a checkpoint is saved if given.
+        """
+        start, games = perf_counter(), self.games
+        for _ in range(steps):
+            self.step()
+            if self.steps % report == 0:
+                elapsed = perf_counter() - start
+                entry = {'steps': self.steps, 'games': self.games,
+                         'games_per_sec': (self.games - games) / max(elapsed, 1e-9),
+                         'delta': float(self._delta), 'accuracy': self.accuracy()}
+                self.history.append(entry)
+                if callback is not None:
+                    callback(entry)
+                if checkpoint is not None:
+                    self.save(checkpoint)
+                start, games = perf_counter(), self.games
+        return self.history
+
+    def save(self, path: str) -> None:
+        """ checkpoint the values and counters, resume with Trainer.load """
+        np.savez(path, size=self.size, values=self.values, steps=self.steps, games=self.games)
+
+    @classmethod
+    def load(cls, path: str, **kwargs) -> 'Trainer':
+        """ trainer resumed from a checkpoint written by save """
+        with np.load(path) as data:
+            trainer = cls(int(data['size']), **kwargs)
+            trainer.values[:] = data['values']
+            trainer.steps, trainer.games = int(data['steps']), int(data['games'])
+        return trainer
+
+    def policy(self, chunk: int = 1 << 14) -> np.ndarray:
+        """ greedy move of every state as (slot, take), (0, 0) for the empty board """
+        policy = np.zeros(len(self.values), dtype=POLICY)
+        for start in range(0, len(self.values), chunk):
+            heaps = _unrank(np.arange(start, min(start + chunk, len(self.values))), self.size)
+            best = self._greedy(heaps)[1]
+            slots = self._cand_slot[best]
+            block = policy[start:start + len(heaps)]
+            block['row'] = slots
+            block['take'] = heaps[np.arange(len(heaps)), slots] - self._cand_new[best]
+        policy[0] = (0, 0)
+        return policy
+
+    def export(self, path: str) -> None:
+        """ write the policy as .npy file, loaded memory mapped by PlayerPolicy """
+        np.save(path, self.policy())
+
+
+def main() -> None:
+    import argparse  # only needed on the command line, keeps import nimm light
+    parser = argparse.ArgumentParser(description='self-play training of a nimm policy')
+    parser.add_argument('size', type=int, help='board size')
+    parser.add_argument('path', help='policy file to export (.npy)')
+    parser.add_argument('--steps', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=1024)
+    parser.add_argument('--report', type=int, default=1000)
+    parser.add_argument('--checkpoint', default=None, help='checkpoint file (.npz)')
+    parser.add_argument('--resume', action='store_true', help='continue from --checkpoint')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.resume:
+        trainer = Trainer.load(args.checkpoint, batch=args.batch, seed=args.seed)
+    else:
+        trainer = Trainer(args.size, batch=args.batch, seed=args.seed)
+
+    def progress(entry: dict) -> None:
+        print(f'step {entry["steps"]:>8}  {entry["games"]:>10} games  '
+              f'{entry["games_per_sec"]:>10.0f} games/s  delta {entry["delta"]:.4f}  '
+              f'accuracy {entry["accuracy"]:.4f}')
+
+    trainer.train(args.steps, args.report, args.checkpoint, progress)
+    trainer.export(args.path)
+    print(f'Wrote policy of {len(trainer.values)} states to {args.path}')
@@ -0,0 +1 @@
+from .Trainer import Trainer, state_index, POLICY
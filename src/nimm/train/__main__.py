@@ -0,0 +1,3 @@
+from .Trainer import main
+
+main()